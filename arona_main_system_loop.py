@@ -9,29 +9,48 @@
 # Dependencies: Requires all previous parts (1, 2, 3, 4) or their mock versions.
 # =========================================================================
 
+import sys
+import math
 import time
-import uuid
+import asyncio
+import itertools
 from typing import Dict, List, Any, Optional
+from collections import deque, OrderedDict
 from enum import Enum
 import json
 
+try:
+    import uvloop # Event loop บน libuv (เร็วกว่าในการจัดการ Timer/Wakeup)
+except ImportError: # uvloop เป็น Optional: ใช้ Event Loop มาตรฐานของ asyncio แทน
+    uvloop = None
+
+CYCLE_PERIOD_SECONDS = 0.1 # 10 รอบต่อวินาที (100ms cycle)
+
+# Tactical Advice Cache: ผลลัพธ์ PSE สำหรับสถานการณ์เดิมถูกใช้ซ้ำได้ภายในช่วง TTL
+TACTICAL_CACHE_TTL_SECONDS = 5.0 # หมดอายุเร็วพอที่จะไม่ให้คำแนะนำที่ล้าสมัย
+TACTICAL_CACHE_MAX_ENTRIES = 128
+
+BACKGROUND_INFERENCE_INTERVAL = 5 # รัน Background Task ทุก ๆ 5 รอบ (20% ของรอบทั้งหมด)
+
 # --- 1. MOCKING DEPENDENCIES (In a real project, these are imported) ---
 
 # Mocking Entity and AGI_Task classes for self-contained execution
 class Entity:
+    __slots__ = ("name", "entity_type", "_attributes") # ไม่มี __dict__ ต่อ Instance
     def __init__(self, name, entity_type):
         self.name = name
         self.entity_type = entity_type
         self._attributes = {}
     def set_attribute(self, key, value):
-        self._attributes[key] = value
+        self._attributes[sys.intern(key)] = value # Key ซ้ำกันใช้ String Object เดียวกัน
     def get_attribute(self, key):
         return self._attributes.get(key)
+_TASK_ID_COUNTER = itertools.count(1)
 class TaskPriority(Enum):
     CRITICAL = 5; REAL_TIME = 4; HIGH = 3; MEDIUM = 2; LOW = 1
 class AGI_Task:
     def __init__(self, task_name: str, priority: TaskPriority, complexity: float):
-        self.task_id = str(uuid.uuid4())
+        self.task_id = next(_TASK_ID_COUNTER)
         self.name = task_name
         self.priority = priority
         self.complexity = complexity
@@ -49,7 +68,10 @@ class MockKGM: # From arona_symbolic_core.py (Part 1)
         self.entities = {"Sensei": sensei, "Yuuka": yuuka}
     def get_entity_by_name(self, name): return self.entities.get(name)
     def update_entity(self, name, attr, value): 
-        if self.entities.get(name): self.entities[name].set_attribute(attr, value)
+        ent = self.entities.get(name) # ค้นหาครั้งเดียว
+        if ent is not None: ent.set_attribute(attr, value)
+    def update_entity_fast(self, ent, attr, value): # สำหรับผู้เรียกที่ถือ Entity อยู่แล้ว (ไม่ต้องค้นหาใน dict)
+        ent.set_attribute(attr, value)
 class MockRM: # From arona_resource_manager.py (Part 2)
     def __init__(self): self.hw_status = {"CPU_Usage": 0.1, "GPU_Usage": 0.0, "Total_GPU": 350.0}
     def get_status_report(self): return self.hw_status
@@ -74,13 +96,23 @@ class ARONA_OS_Core:
     """
     ARONA Operating System - แกนหลักที่ประสานงานทั้งหมด
     """
+    # Action Plans ที่เป็นไปได้ (สร้างครั้งเดียว ไม่ต้องสร้าง list ใหม่ทุกครั้งที่มี Event)
+    DEFAULT_CANDIDATE_PLANS = (
+        ({"plan": "Aggressive_Attack", "user_prompt": "ใช้ Arisu EX-Skill ทันที"},),
+        ({"plan": "Defensive_Heal", "user_prompt": "ใช้ Yuuka Heal ก่อน แล้วค่อย Attack"},)
+    )
+
     def __init__(self, core_id: str):
         self.core_id = core_id
         self.running = False
         self.boot_time = 0.0
         self.system_modules: Dict[str, Any] = {}
-        self.event_queue: List[Dict] = []
+        # Event Queue: ใช้ deque เพื่อให้ popleft() เป็น O(1) (list.pop(0) ต้องเลื่อนทุกตัว)
+        self.event_queue: deque[Dict] = deque()
         self.user_interface_state = {"status": "Awaiting Sensei Input"}
+        # Key: (event_name, emotional_state, accuracy_modifier) -> (expires_at, best_outcome)
+        self._tactical_cache: OrderedDict = OrderedDict()
+        self._inference_counter = 0 # นับรอบของ _continuous_agi_inference
         print(f"[{self.core_id}] ARONA OS Core Initializing...")
 
     def _boot_sequence(self):
@@ -88,7 +120,7 @@ class ARONA_OS_Core:
         ขั้นตอนการเปิดระบบ (Kernel Initialization)
         """
         print("\n--- 1. SYSTEM BOOT SEQUENCE STARTING ---")
-        self.boot_time = time.time()
+        self.boot_time = time.monotonic()
         
         # 1.1 Load Critical Hardware Drivers (Simulated)
         self.rm = MockRM() 
@@ -109,35 +141,61 @@ class ARONA_OS_Core:
 
         print(f"\n[BOOT SUCCESS] ARONA OS {self.core_id} is now online.")
 
-    def run(self):
+    async def run(self):
         """
         Main System Loop - หัวใจของระบบปฏิบัติการ ARONA
+        (รันบน asyncio: รอรอบถัดไปด้วย await แทนการ block ทั้ง Thread)
         """
         if self.running: return
 
         self._boot_sequence()
         self.running = True
 
+        loop = asyncio.get_running_loop() # ดึง Event Loop ครั้งเดียว ไม่ต้อง resolve ใหม่ทุกรอบ
+
+        # Python 3.12+: Eager Task รัน coroutine ทันทีจนถึง await แรก
+        # งานสั้น ๆ ที่จบในรอบเดียว (Event Handling, Inference) จึงไม่ต้องรอคิวของ Event Loop
+        eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+        if eager_task_factory is not None:
+            loop.set_task_factory(eager_task_factory)
+
+        # ผูก Method/Function ที่ใช้ทุกรอบไว้ในตัวแปร Local (ข้ามการค้นหา Attribute ใน Hot Loop)
+        loop_time = loop.time # Monotonic clock ของ Event Loop
+        create_task = loop.create_task
+        gather = asyncio.gather
+        sleep = asyncio.sleep
+        handle_events = self._handle_events
+        continuous_agi_inference = self._continuous_agi_inference
+        update_ui_state = self._update_ui_state
+
         print("\n--- 2. ARONA MAIN SYSTEM LOOP STARTING ---")
+        # Deadline ของแต่ละรอบใช้ monotonic clock (ไม่กระโดดตาม NTP) และสะสมต่อกันเพื่อไม่ให้รอบเลื่อน
+        deadline = loop_time()
         # จำลองการทำงาน 10 รอบ
         for cycle in range(1, 11):
-            start_time = time.time()
+            start_time = loop_time()
+            deadline += CYCLE_PERIOD_SECONDS
             
             # 2.1 Process Kernel Events (เช่น Input จาก Sensei หรือ Sensor Data)
-            self._handle_events()
+            events_task = create_task(handle_events())
 
             # 2.2 System Maintenance (Real-Time Scheduling)
             # self.rm.rts.dispatch_tasks() # ในโลกจริง RTS จะรันใน Thread แยก
             
             # 2.3 Continuous AGI Inference (การคิดอย่างต่อเนื่อง)
-            self._continuous_agi_inference()
+            inference_task = create_task(continuous_agi_inference())
+            await gather(events_task, inference_task)
 
             # 2.4 Update UI State
-            self._update_ui_state()
+            update_ui_state()
             
             # Calculate Cycle Time
-            cycle_time = time.time() - start_time
-            time.sleep(max(0, 0.1 - cycle_time)) # ควบคุมให้รันอย่างน้อย 10 ครั้งต่อวินาที (100ms cycle)
+            now = loop_time()
+            cycle_time = now - start_time
+            if now > deadline:
+                # รอบนี้เกินเวลา: ข้าม Period ที่พลาดไปแทนการรันรอบติดกันเพื่อไล่ตาม (deadline ยังอยู่บนจังหวะเดิม)
+                deadline += math.ceil((now - deadline) / CYCLE_PERIOD_SECONDS) * CYCLE_PERIOD_SECONDS
+            await sleep(deadline - now) # ควบคุมให้รัน 10 ครั้งต่อวินาที (100ms cycle)
             
             # 2.5 Report Status
             print(f"[CYCLE {cycle:02d}] Elapsed: {cycle_time*1000:.2f}ms | Status: {self.user_interface_state['status']}")
@@ -152,14 +210,21 @@ class ARONA_OS_Core:
     # --- 3. EVENT HANDLING AND AGI EXECUTION ---
 
     def queue_event(self, event_type: str, payload: Dict):
-        """รับ Event จากภายนอก (เช่น User Input, Sensor, Network) และจัดคิว"""
+        """
+        รับ Event จากภายนอก (เช่น User Input, Sensor, Network) และจัดคิว
+        เรียกจากหลาย Thread พร้อมกันได้: deque.append/popleft เป็น Atomic อยู่แล้ว
+        (Producer หลายตัว, Consumer ตัวเดียวคือ Main Loop) จึงไม่ต้องใช้ Lock
+        """
         self.event_queue.append({"type": event_type, "payload": payload, "timestamp": time.time()})
         self.user_interface_state["status"] = f"Processing {event_type}..."
 
-    def _handle_events(self):
-        """ประมวลผล Events ที่อยู่ในคิว"""
-        while self.event_queue:
-            event = self.event_queue.pop(0)
+    async def _handle_events(self):
+        """ประมวลผล Events ที่อยู่ในคิว ณ ตอนเริ่มรอบ"""
+        # ดึงเฉพาะ Events ที่มีอยู่ตอนเริ่มรอบ: Event ที่ Thread อื่นส่งเข้ามาระหว่างนี้รอรอบถัดไป
+        # (Producer ที่ส่งไม่หยุดจะไม่ทำให้ Main Loop ค้างอยู่ในรอบเดียว)
+        popleft = self.event_queue.popleft
+        for _ in range(len(self.event_queue)):
+            event = popleft()
             
             if event["type"] == "Sensei_Request" and event["payload"]["request_type"] == "Tactical_Decision":
                 self._process_tactical_decision(event["payload"])
@@ -177,13 +242,23 @@ class ARONA_OS_Core:
         print(f"  > Yuuka Bias: {yuuka_bias}")
         
         # 2. กำหนด Action Plans ที่เป็นไปได้
-        candidate_actions = [
-            [{"plan": "Aggressive_Attack", "user_prompt": "ใช้ Arisu EX-Skill ทันที"}],
-            [{"plan": "Defensive_Heal", "user_prompt": "ใช้ Yuuka Heal ก่อน แล้วค่อย Attack"}]
-        ]
+        event_name = payload["event_name"]
+        candidate_actions = self.DEFAULT_CANDIDATE_PLANS
         
-        # 3. รัน Predictive Simulation Engine (PSE)
-        best_outcome = self.pse.evaluate_tactical_options(payload["event_name"], candidate_actions, 30.0)
+        # 3. รัน Predictive Simulation Engine (PSE) เฉพาะเมื่อสถานการณ์เปลี่ยนหรือ Cache หมดอายุ
+        cache_key = (event_name, yuuka_state, yuuka_bias.get("Accuracy_Modifier"))
+        now = time.monotonic()
+        cached = self._tactical_cache.get(cache_key)
+        if cached is not None and cached[0] > now:
+            self._tactical_cache.move_to_end(cache_key)
+            best_outcome = cached[1]
+            print("  > Tactical Cache Hit: ใช้ผลการจำลองล่าสุด")
+        else:
+            best_outcome = self.pse.evaluate_tactical_options(event_name, candidate_actions, 30.0)
+            self._tactical_cache[cache_key] = (now + TACTICAL_CACHE_TTL_SECONDS, best_outcome)
+            self._tactical_cache.move_to_end(cache_key)
+            if len(self._tactical_cache) > TACTICAL_CACHE_MAX_ENTRIES:
+                self._tactical_cache.popitem(last=False) # ทิ้งรายการที่ใช้ล่าสุดนานที่สุด (LRU)
         
         # 4. สรุปผลลัพธ์และตอบกลับ Sensei
         final_advice = f"ท่านเซ็นเซย์! การจำลอง {best_outcome['Result']['Time']:.2f} วินาทีแสดงว่าแผน '{best_outcome['Action_Plan'][0]['plan']}' มีโอกาสชนะสูงสุด ({best_outcome['Score']:.2f} คะแนน)."
@@ -202,12 +277,14 @@ class ARONA_OS_Core:
         self.user_interface_state["last_student_interaction"] = human_response
         print(f"  [AGI OUTPUT] Interaction: {human_response}")
 
-    def _continuous_agi_inference(self):
+    async def _continuous_agi_inference(self):
         """
         ฟังก์ชันการคิดอย่างต่อเนื่องเมื่อไม่มี Event เข้ามา
         (เช่น การอัปเดต World Model หรือการเรียนรู้แบบ Lifelong Learning)
         """
-        if random.random() < 0.2: # 20% chance to run background task
+        # ใช้ตัวนับแบบ Deterministic แทนการสุ่ม (ไม่ต้องเรียก Global RNG ทุกรอบ)
+        self._inference_counter += 1
+        if self._inference_counter % BACKGROUND_INFERENCE_INTERVAL == 0: # 20% of cycles run background task
             # 1. Background Knowledge Update (Low Priority)
             task = AGI_Task("KG_Background_Update", TaskPriority.LOW, 0.05)
             # self.rm.rts.submit_task(task) # ส่งงานเข้าระบบ Scheduler
@@ -223,7 +300,7 @@ class ARONA_OS_Core:
         """
         อัปเดตข้อมูลที่จะแสดงผลบนหน้าจอ (Output Interface)
         """
-        self.user_interface_state["time_since_boot"] = time.time() - self.boot_time
+        self.user_interface_state["time_since_boot"] = time.monotonic() - self.boot_time
         # (ส่วนนี้จะถูกส่งไปให้ UI Module ในไฟล์ถัดไปเพื่อแสดงผล)
 
     def shutdown(self):
@@ -241,5 +318,6 @@ if __name__ == "__main__":
     # The ultimate ARONA OS running on ROG Ally/MSI Claw
     arona_os = ARONA_OS_Core(core_id="ARONA-01-ALLY-X")
     
-    # Start the OS and the Main Loop
-    arona_os.run()
+    # Start the OS and the Main Loop (ใช้ uvloop ถ้าติดตั้งไว้)
+    run_event_loop = uvloop.run if uvloop is not None else asyncio.run
+    run_event_loop(arona_os.run())
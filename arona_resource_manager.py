@@ -9,12 +9,19 @@
 # Note: In a real OS, this would interface directly with the Kernel via C/C++ libraries.
 # =========================================================================
 
+import sys
 import time
-import random
-from typing import Dict, List, Any, Optional
-from collections import deque
+import heapq
+import itertools
+from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
 
+try:
+    import orjson # JSON Encoder แบบ C (เร็วกว่า json มาตรฐานหลายเท่า)
+except ImportError: # orjson เป็น Optional: ใช้ json มาตรฐานแทน
+    orjson = None
+    import json
+
 # --- 1. SYSTEM DEFINITIONS AND CONFIGURATION ---
 
 # Assume core definition from Part 1
@@ -25,6 +32,22 @@ TOTAL_CPU_CORES = 8       # Logical Cores
 TOTAL_GPU_POWER = 100.0   # Baseline power (e.g., 100% of iGPU)
 TOTAL_RAM_GB = 16         # GB
 MAX_ALLOCATION_PER_TASK = 0.50 # Max 50% of any single resource per AGI task
+MAX_TASK_DURATION_SECONDS = 0.5 # เวลารันจำลองของ Task ที่ซับซ้อนที่สุด (complexity = 1.0)
+
+# ลำดับคงที่ของทรัพยากรภายใน (ใช้เป็น index ของ Structure-of-Arrays ใน ResourceManager)
+RESOURCE_ORDER = ("CPU", "GPU", "RAM")
+
+# ความต้องการทรัพยากรต่อหน่วยความซับซ้อน และเพดานต่อ Task (คำนวณครั้งเดียวตอนโหลดโมดูล)
+# A.R.O.N.A. AGI Core ใช้ CPU/RAM มากกว่า GPU สำหรับงานตรรกะ
+CPU_PER_COMPLEXITY = 0.2 * TOTAL_CPU_CORES # 20% of complexity for CPU
+GPU_PER_COMPLEXITY = 0.1 * TOTAL_GPU_POWER # 10% of complexity for GPU (สำหรับการประมวลผลขนาน)
+RAM_PER_COMPLEXITY = 0.5 * TOTAL_RAM_GB    # 50% of complexity for RAM (สำหรับการโหลดข้อมูล)
+CPU_CAP_PER_TASK = MAX_ALLOCATION_PER_TASK * TOTAL_CPU_CORES
+GPU_CAP_PER_TASK = MAX_ALLOCATION_PER_TASK * TOTAL_GPU_POWER
+RAM_CAP_PER_TASK = MAX_ALLOCATION_PER_TASK * TOTAL_RAM_GB
+
+# Task ID: ตัวนับจำนวนเต็มภายใน Process (Task ID ใช้เป็น Key ใน running_tasks เท่านั้น ไม่ต้องใช้ UUID)
+_TASK_ID_COUNTER = itertools.count(1)
 
 # Task Priority Levels
 class TaskPriority(Enum):
@@ -38,6 +61,8 @@ class TaskPriority(Enum):
 
 class HardwareStatus:
     """Class สำหรับจำลองสถานะปัจจุบันของฮาร์ดแวร์"""
+    __slots__ = ("name", "total", "unit", "allocated", "available", "is_external") # ไม่มี __dict__ ต่อ Instance
+
     def __init__(self, name: str, total_capacity: float, unit: str):
         self.name = name
         self.total = total_capacity
@@ -66,32 +91,31 @@ class AGI_Task:
     Class สำหรับแสดงงานที่ A.R.O.N.A. ต้องทำ (เช่น ประมวลผลตรรกะ, รัน World Model)
     """
     def __init__(self, task_name: str, priority: TaskPriority, complexity: float):
-        self.task_id = str(uuid.uuid4())
+        self.task_id: int = next(_TASK_ID_COUNTER)
         self.name = task_name
         self.priority = priority
+        # เก็บค่าและชื่อของ Priority ไว้ตรง ๆ (Scheduler ใช้ทุกครั้งที่ submit/dispatch ไม่ต้องผ่าน Enum)
+        self.priority_value: int = priority.value
+        self.priority_name: str = priority.name
         self.complexity = complexity # ค่าความซับซ้อน (0.1 - 1.0)
-        self.resource_request: Dict[str, float] = self._calculate_request()
+        # ความต้องการทรัพยากรแบบ tuple เรียงตาม RESOURCE_ORDER (CPU, GPU, RAM) ใช้ในการจัดสรรทั้งหมด
+        self.resource_request_vec: Tuple[float, float, float] = self._calculate_request()
+        self.resource_request: Dict[str, float] = dict(zip(RESOURCE_ORDER, self.resource_request_vec)) # สำหรับแสดงผล
         self.creation_time = time.time()
         self.status = "Pending"
         self.start_time = 0.0
+        # เวลารันที่คาดไว้ (จำลอง): งานยิ่งซับซ้อนยิ่งใช้เวลานาน
+        self.expected_duration = complexity * MAX_TASK_DURATION_SECONDS
 
-    def _calculate_request(self) -> Dict[str, float]:
-        """คำนวณความต้องการทรัพยากรเบื้องต้นจากความซับซ้อน"""
-        # A.R.O.N.A. AGI Core ใช้ CPU/RAM มากกว่า GPU สำหรับงานตรรกะ
-        cpu_req = self.complexity * 0.2 # 20% of complexity for CPU
-        gpu_req = self.complexity * 0.1 # 10% of complexity for GPU (สำหรับการประมวลผลขนาน)
-        ram_req = self.complexity * 0.5 # 50% of complexity for RAM (สำหรับการโหลดข้อมูล)
+    def _calculate_request(self) -> Tuple[float, float, float]:
+        """คำนวณความต้องการทรัพยากรเบื้องต้นจากความซับซ้อน (CPU, GPU, RAM)"""
+        # ใช้ค่าคงที่ที่คำนวณไว้แล้ว: คูณหนึ่งครั้งและจำกัดเพดานต่อทรัพยากร
+        complexity = self.complexity
+        cpu_req = min(complexity * CPU_PER_COMPLEXITY, CPU_CAP_PER_TASK)
+        gpu_req = min(complexity * GPU_PER_COMPLEXITY, GPU_CAP_PER_TASK)
+        ram_req = min(complexity * RAM_PER_COMPLEXITY, RAM_CAP_PER_TASK)
         
-        # ปรับ requests ให้อยู่ในขีดจำกัด
-        cpu_req = min(cpu_req * TOTAL_CPU_CORES, MAX_ALLOCATION_PER_TASK * TOTAL_CPU_CORES)
-        gpu_req = min(gpu_req * TOTAL_GPU_POWER, MAX_ALLOCATION_PER_TASK * TOTAL_GPU_POWER)
-        ram_req = min(ram_req * TOTAL_RAM_GB, MAX_ALLOCATION_PER_TASK * TOTAL_RAM_GB)
-        
-        return {
-            "CPU": cpu_req,
-            "GPU": gpu_req,
-            "RAM": ram_req
-        }
+        return (cpu_req, gpu_req, ram_req)
     
     def execute_and_finish(self, duration: float):
         """จำลองการทำงานของ Task และเปลี่ยนสถานะเป็น Finished"""
@@ -109,85 +133,136 @@ class ResourceManager:
     และทำการจัดสรรทรัพยากรให้กับ AGI Tasks.
     """
     def __init__(self):
-        # Hardware Status
-        self.hardware: Dict[str, HardwareStatus] = {
-            "CPU": HardwareStatus("CPU_Internal", TOTAL_CPU_CORES, "Cores"),
-            "GPU": HardwareStatus("GPU_Internal", TOTAL_GPU_POWER, "%"),
-            "RAM": HardwareStatus("RAM_Internal", TOTAL_RAM_GB, "GB")
-        }
+        # Hardware Status แบบ Structure-of-Arrays: ทุก list เรียงตาม RESOURCE_ORDER
+        # (การตรวจสอบ/จัดสรรอ่านค่าตัวเลขจาก list โดยตรง ไม่ต้องผ่าน attribute ของ object ทีละตัว)
+        self._idx: Dict[str, int] = {res_name: i for i, res_name in enumerate(RESOURCE_ORDER)}
+        self._names: List[str] = ["CPU_Internal", "GPU_Internal", "RAM_Internal"]
+        self._units: List[str] = ["Cores", "%", "GB"]
+        self._total: List[float] = [TOTAL_CPU_CORES, TOTAL_GPU_POWER, TOTAL_RAM_GB]
+        self._allocated: List[float] = [0.0, 0.0, 0.0]
+        self._available: List[float] = list(self._total)
         self.external_hardware: Dict[str, HardwareStatus] = {}
+        # รายงานสถานะล่าสุด (None = มีการเปลี่ยนแปลงตั้งแต่รายงานครั้งก่อน ต้องสร้างใหม่)
+        self._status_report: Optional[Dict[str, Any]] = None
         print("[RM] Resource Manager initialized with internal hardware.")
 
     def add_external_hardware(self, name: str, capacity: float, unit: str):
         """จำลองการเชื่อมต่อ External GPU (eGPU) หรือ External RAM"""
-        if name in self.hardware or name in self.external_hardware:
+        if name in self._idx or name in self.external_hardware:
             print(f"[RM WARNING] Hardware {name} already exists.")
             return
 
         hw = HardwareStatus(name, capacity, unit)
         hw.is_external = True
         self.external_hardware[name] = hw
+        self._status_report = None
         
         # ผสาน External Power เข้ากับ Total Power
         if "GPU" in name:
-            self.hardware["GPU"].total += capacity
-            self.hardware["GPU"].name = "GPU_Hybrid" # เปลี่ยนชื่อเป็น Hybrid
-            print(f"[RM INFO] eGPU ({name}) connected. Total GPU Power: {self.hardware['GPU'].total}%")
+            i = self._idx["GPU"]
+            self._total[i] += capacity
+            self._available[i] += capacity
+            self._names[i] = "GPU_Hybrid" # เปลี่ยนชื่อเป็น Hybrid
+            print(f"[RM INFO] eGPU ({name}) connected. Total GPU Power: {self._total[i]}%")
         
         elif "RAM" in name:
-            self.hardware["RAM"].total += capacity
-            self.hardware["RAM"].name = "RAM_Hybrid"
-            print(f"[RM INFO] External RAM ({name}) connected. Total RAM: {self.hardware['RAM'].total} GB")
+            i = self._idx["RAM"]
+            self._total[i] += capacity
+            self._available[i] += capacity
+            self._names[i] = "RAM_Hybrid"
+            print(f"[RM INFO] External RAM ({name}) connected. Total RAM: {self._total[i]} GB")
 
-    def allocate_resources(self, task: AGI_Task) -> bool:
-        """พยายามจัดสรรทรัพยากรตามที่ Task ร้องขอ"""
-        
-        can_allocate = True
-        required_resources = {}
-
-        # 1. ตรวจสอบความพร้อมของทรัพยากร
-        for res_name, req_amount in task.resource_request.items():
-            if res_name in self.hardware:
-                hw = self.hardware[res_name]
-                if hw.available < req_amount:
-                    can_allocate = False
-                    break
-                required_resources[res_name] = req_amount
-            else:
-                # ถ้ามีทรัพยากรที่ A.R.O.N.A. ไม่รู้จัก
-                print(f"[RM WARNING] Task requires unknown resource: {res_name}")
-
-        # 2. ทำการจัดสรร
-        if can_allocate:
-            for res_name, req_amount in required_resources.items():
-                hw = self.hardware[res_name]
-                hw.update_usage(hw.allocated + req_amount) # เพิ่มการใช้งาน
-                print(f"[RM ALLOCATED] Task {task.name} allocated {req_amount:.2f} {hw.unit} of {res_name}.")
+    def allocate_resources(self, task: AGI_Task, log_lines: Optional[List[str]] = None) -> bool:
+        """
+        พยายามจัดสรรทรัพยากรตามที่ Task ร้องขอ (Batch ขนาด 1 ของ allocate_batch: ตรรกะชุดเดียวกัน)
+        ถ้าส่ง log_lines มา ข้อความ Log จะถูกเก็บไว้ให้ผู้เรียกพิมพ์รวมครั้งเดียวแทนการ print ทีละบรรทัด
+        """
+        return self.allocate_batch([task], 1, log_lines)[0]
+
+    def allocate_batch(self, tasks: List[AGI_Task], max_allocations: int, log_lines: Optional[List[str]] = None) -> List[bool]:
+        """
+        จัดสรรทรัพยากรให้หลาย Tasks ในรอบเดียว ตามลำดับที่ส่งมา (เรียงตาม Priority แล้ว)
+        ยอดใช้งานสะสมอยู่ในตัวแปร Local และบันทึกกลับลง Array ครั้งเดียวตอนจบ
+        Task ที่ทรัพยากรไม่พอจะถูกข้าม (Queued_Blocked) แต่ Task ถัดไปยังมีสิทธิ์ได้รับการจัดสรร
+        คืนค่าผลลัพธ์ (True/False) ของ Tasks ที่ถูกตรวจสอบ ซึ่งหยุดเมื่อครบ max_allocations
+        """
+        emit = log_lines.append if log_lines is not None else print
+        units = self._units
+        cpu_total, gpu_total, ram_total = self._total
+        cpu_used, gpu_used, ram_used = self._allocated
+        results: List[bool] = []
+        granted = 0
+
+        for task in tasks:
+            if granted >= max_allocations:
+                break
+
+            cpu_req, gpu_req, ram_req = task.resource_request_vec
+            if cpu_total - cpu_used < cpu_req or gpu_total - gpu_used < gpu_req or ram_total - ram_used < ram_req:
+                task.status = "Queued_Blocked"
+                results.append(False)
+                continue
+
+            # เพิ่มการใช้งาน
+            cpu_used += cpu_req
+            gpu_used += gpu_req
+            ram_used += ram_req
+            for i, req_amount in enumerate(task.resource_request_vec):
+                emit(f"[RM ALLOCATED] Task {task.name} allocated {req_amount:.2f} {units[i]} of {RESOURCE_ORDER[i]}.")
             task.status = "Running"
-            return True
-        else:
-            task.status = "Queued_Blocked"
-            return False
+            results.append(True)
+            granted += 1
 
-    def free_resources(self, task: AGI_Task):
-        """คืนทรัพยากรเมื่อ Task เสร็จสิ้น"""
+        if granted:
+            self._allocated[:] = (cpu_used, gpu_used, ram_used)
+            self._available[:] = (cpu_total - cpu_used, gpu_total - gpu_used, ram_total - ram_used)
+            self._status_report = None
+        return results
+
+    def free_resources(self, task: AGI_Task, log_lines: Optional[List[str]] = None):
+        """คืนทรัพยากรเมื่อ Task เสร็จสิ้น (log_lines ใช้เหมือนใน allocate_resources)"""
+        emit = log_lines.append if log_lines is not None else print
         if task.status != "Finished":
-            print(f"[RM WARNING] Cannot free resources. Task {task.name} status is {task.status}.")
+            emit(f"[RM WARNING] Cannot free resources. Task {task.name} status is {task.status}.")
             return
 
-        for res_name, req_amount in task.resource_request.items():
-            if res_name in self.hardware:
-                hw = self.hardware[res_name]
-                hw.update_usage(hw.allocated - req_amount) # ลดการใช้งาน
-                print(f"[RM FREE] Task {task.name} freed {req_amount:.2f} {hw.unit} of {res_name}.")
+        total = self._total
+        allocated = self._allocated
+        available = self._available
+        for i, req_amount in enumerate(task.resource_request_vec):
+            allocated[i] = max(0.0, allocated[i] - req_amount) # ลดการใช้งาน (ห้ามติดลบ)
+            available[i] = total[i] - allocated[i]
+            emit(f"[RM FREE] Task {task.name} freed {req_amount:.2f} {self._units[i]} of {RESOURCE_ORDER[i]}.")
+        self._status_report = None
 
-    def get_status_report(self) -> Dict[str, Any]:
-        """รายงานสถานะทรัพยากรทั้งหมด"""
-        report = {
-            "Internal_Status": [hw.to_dict() for hw in self.hardware.values()],
-            "External_Status": [hw.to_dict() for hw in self.external_hardware.values()]
+    def _hardware_dict(self, i: int) -> Dict[str, Any]:
+        """สร้างรายงานของทรัพยากรภายในช่องที่ i (รูปแบบเดียวกับ HardwareStatus.to_dict)"""
+        return {
+            "name": self._names[i],
+            "total": self._total[i],
+            "unit": self._units[i],
+            "allocated": round(self._allocated[i], 2),
+            "available": round(self._available[i], 2),
+            "is_external": False
         }
-        return report
+
+    def get_status_report(self) -> Dict[str, Any]:
+        """
+        รายงานสถานะทรัพยากรทั้งหมด
+        ถ้าไม่มีการจัดสรร/คืนทรัพยากรตั้งแต่ครั้งก่อน จะคืนรายงานเดิม (ผู้เรียกไม่ควรแก้ไข dict ที่ได้รับ)
+        """
+        if self._status_report is None:
+            self._status_report = {
+                "Internal_Status": [self._hardware_dict(i) for i in range(len(RESOURCE_ORDER))],
+                "External_Status": [hw.to_dict() for hw in self.external_hardware.values()]
+            }
+        return self._status_report
+
+def format_status_report(report: Dict[str, Any]) -> str:
+    """แปลงรายงานสถานะเป็น JSON (ย่อหน้า 2 ช่อง) ใช้ orjson ถ้ามี"""
+    if orjson is not None:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(report, indent=2)
 
 # --- 4. REAL-TIME TASK SCHEDULER (RTS) ---
 
@@ -197,56 +272,74 @@ class RealTimeScheduler:
     """
     def __init__(self, rm: ResourceManager):
         self.rm = rm
-        # Task Queue: ใช้ deque เพื่อจัดเก็บ Tasks ที่รอดำเนินการ
-        self.task_queue: deque[AGI_Task] = deque()
-        self.running_tasks: Dict[str, AGI_Task] = {}
+        # Task Queue: ใช้ heapq เก็บ (-priority, ลำดับการ submit, task)
+        # ลำดับการ submit ทำให้ Tasks ที่ Priority เท่ากันออกแบบ FIFO
+        self.task_queue: List[Tuple[int, int, AGI_Task]] = []
+        self._seq = itertools.count()
+        self.running_tasks: Dict[int, AGI_Task] = {} # Key: task_id
         self.finished_tasks: List[AGI_Task] = []
         print("[RTS] Real-Time Scheduler initialized.")
 
     def submit_task(self, task: AGI_Task):
         """เพิ่ม Task ใหม่เข้าสู่คิว"""
-        self.task_queue.append(task)
-        # จัดเรียงคิวใหม่ตาม Priority (จากมากไปน้อย)
-        self.task_queue = deque(sorted(self.task_queue, key=lambda t: t.priority.value, reverse=True))
-        print(f"[RTS SUBMIT] Task '{task.name}' (P:{task.priority.name}) submitted.")
+        # O(log N) แทนการ sort คิวทั้งหมดใหม่ทุกครั้ง
+        heapq.heappush(self.task_queue, (-task.priority_value, next(self._seq), task))
+        print(f"[RTS SUBMIT] Task '{task.name}' (P:{task.priority_name}) submitted.")
+
+    def submit_tasks(self, tasks: List[AGI_Task]):
+        """เพิ่ม Tasks หลายตัวเข้าสู่คิวในครั้งเดียว (ต่อท้ายแล้ว heapify ครั้งเดียว O(N) แทนการ push ทีละตัว)"""
+        seq = self._seq
+        self.task_queue.extend((-task.priority_value, next(seq), task) for task in tasks)
+        heapq.heapify(self.task_queue)
+        for task in tasks:
+            print(f"[RTS SUBMIT] Task '{task.name}' (P:{task.priority_name}) submitted.")
 
     def dispatch_tasks(self, max_tasks_to_check: int = 5):
         """
         พยายามรัน Tasks ที่อยู่ในคิวตามลำดับ Priority
+        (Log ทั้งรอบถูกรวมแล้วเขียนลง stdout ครั้งเดียวตอนจบ เพื่อไม่ให้ Hot Path ติดอยู่กับ I/O ทีละบรรทัด)
         """
+        log_lines: List[str] = []
+
         # 1. ตรวจสอบ Tasks ที่รันเสร็จแล้ว
-        finished_now = []
-        for task_id, task in list(self.running_tasks.items()):
-            # จำลองการทำงานเสร็จสิ้นแบบสุ่ม (ในโลกจริงคือการได้รับสัญญาณจาก AGI Core)
-            if time.time() - task.start_time > 0.5 or random.random() < 0.1: # 10% chance to finish quickly
+        now = time.time()
+        finished_ids = []
+        for task_id, task in self.running_tasks.items():
+            # จำลองการทำงานเสร็จสิ้นเมื่อถึงเวลาที่คาดไว้ (ในโลกจริงคือการได้รับสัญญาณจาก AGI Core)
+            if task.start_time + task.expected_duration < now:
                 task.status = "Finished"
-                finished_now.append(task_id)
-                self.rm.free_resources(task)
+                finished_ids.append(task_id)
+                self.rm.free_resources(task, log_lines)
                 self.finished_tasks.append(task)
-                del self.running_tasks[task_id]
 
-        # 2. พยายามรัน Tasks จากคิว
-        tasks_dispatched = 0
-        tasks_to_process = list(self.task_queue)[:max_tasks_to_check] # ดูแค่ Tasks ลำดับต้น ๆ
+        # ลบออกหลังวนครบ (ไม่ต้อง copy running_tasks ทั้งก้อนเพื่อให้ลบระหว่างวนได้)
+        for task_id in finished_ids:
+            del self.running_tasks[task_id]
 
-        for task in tasks_to_process:
-            if tasks_dispatched >= 2: # Limit new dispatching per cycle
-                break
-                
-            if task.status == "Pending" or task.status == "Queued_Blocked":
-                
-                if self.rm.allocate_resources(task):
-                    task.start_time = time.time()
-                    self.running_tasks[task.task_id] = task
-                    self.task_queue.remove(task)
-                    tasks_dispatched += 1
-                    print(f"[RTS DISPATCHED] Running Task: {task.name} (P:{task.priority.name})")
-                else:
-                    # ทรัพยากรไม่พอ, Task ถูกบล็อกและยังอยู่ในคิว
-                    print(f"[RTS BLOCKED] Task: {task.name} blocked due to insufficient resources.")
+        # 2. พยายามรัน Tasks จากคิว: ดึง Tasks ลำดับต้น ๆ ออกมาแล้วจัดสรรเป็น Batch เดียว
+        candidates = [heapq.heappop(self.task_queue) for _ in range(min(max_tasks_to_check, len(self.task_queue)))]
+        runnable = [entry[2] for entry in candidates if entry[2].status == "Pending" or entry[2].status == "Queued_Blocked"]
+        results = self.rm.allocate_batch(runnable, 2, log_lines) # Limit new dispatching per cycle
+
+        dispatched_ids = set()
+        for task, allocated in zip(runnable, results):
+            if allocated:
+                task.start_time = now
+                dispatched_ids.add(task.task_id)
+                self.running_tasks[task.task_id] = task
+                log_lines.append(f"[RTS DISPATCHED] Running Task: {task.name} (P:{task.priority_name})")
+            else:
+                # ทรัพยากรไม่พอ, Task ถูกบล็อกและยังอยู่ในคิว
+                log_lines.append(f"[RTS BLOCKED] Task: {task.name} blocked due to insufficient resources.")
+
+        # คืน Tasks ที่ยังรันไม่ได้กลับเข้าคิว (entry เดิมจึงรักษาลำดับ FIFO ไว้)
+        for entry in candidates:
+            if entry[2].task_id not in dispatched_ids:
+                heapq.heappush(self.task_queue, entry)
 
         # 3. แสดงสถานะโดยรวม
-        print(f"[RTS STATUS] Running: {len(self.running_tasks)} | Queued: {len(self.task_queue)} | Finished: {len(self.finished_tasks)}")
+        log_lines.append(f"[RTS STATUS] Running: {len(self.running_tasks)} | Queued: {len(self.task_queue)} | Finished: {len(self.finished_tasks)}")
+        sys.stdout.write("\n".join(log_lines) + "\n")
         
         return self.rm.get_status_report()
 
@@ -274,10 +367,7 @@ def run_arona_resource_system():
     task_low_log = AGI_Task("System_Log_Backup", TaskPriority.LOW, 0.1)
     
     # 4. Submit Tasks (ลำดับการ submit ไม่สำคัญ RTS จะจัดเรียงเอง)
-    rts.submit_task(task_low_log)
-    rts.submit_task(task_high_stress)
-    rts.submit_task(task_critical)
-    rts.submit_task(task_realtime)
+    rts.submit_tasks([task_low_log, task_high_stress, task_critical, task_realtime])
     
     # 5. Run Multiple Dispatch Cycles
     print("\n--- Running Dispatch Cycle 1 (Critical Tasks First) ---")
@@ -293,7 +383,7 @@ def run_arona_resource_system():
     
     print("\n=============================================")
     print("[FINAL RESOURCE REPORT]")
-    print(json.dumps(status_report, indent=2))
+    print(format_status_report(status_report))
     print("=============================================")
 
 if __name__ == "__main__":
@@ -7,10 +7,27 @@
 # Total LOC: Approx. 1400 lines (Well-commented for clarity and future C/C++ porting)
 # =========================================================================
 
+import os
+import sys
+import mmap
 import time
-import uuid
+import itertools
 import json
-from typing import Dict, List, Any, Optional
+import logging
+import operator
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+try:
+    import orjson # Optional C encoder; stdlib json is used when it is not installed
+except ImportError:
+    orjson = None
+from collections import defaultdict, OrderedDict
+from itertools import chain
+from typing import Dict, List, Any, Optional, Tuple, Set
+
+# Library logging: silent unless the host application configures handlers
+logger = logging.getLogger("arona.kgm")
+logger.addHandler(logging.NullHandler())
 
 # --- 1. GLOBAL SYSTEM CONSTANTS AND CONFIGURATION ---
 # The core ID of the A.R.O.N.A. system (similar to Shittim Chest ID)
@@ -21,26 +38,79 @@ INIT_TIMESTAMP = time.time()
 # Knowledge Graph (KG) configuration
 KG_ENTITY_LIMIT = 50000000  # Max entities (e.g., students, locations, events, items)
 KG_RELATION_LIMIT = 250000000 # Max relationships (e.g., 'is_member_of', 'is_vulnerable_to')
+# Limits are checked every KG_LIMIT_CHECK_MASK + 1 inserts, so they may be overshot by fewer than that many
+KG_LIMIT_CHECK_MASK = 0xFFFF
 KG_UPDATE_RATE = 0.5         # Update check rate in seconds
+KG_SNAPSHOT_INTERVAL = 60.0  # Min seconds between full snapshot rewrites; saves in between only append the WAL
+KG_WAL_SUFFIX = ".log"       # Write-ahead log sidecar: '<snapshot path>.log'
+# Attributes indexed by (key, value) -> entity UIDs, so rules can jump straight to matching entities
+KG_INDEXED_ATTRIBUTES = ("Status",)
+# Hot numeric attributes mirrored into contiguous columns (one float64 slot per entity row, NaN = unset)
+KG_COLUMN_ATTRIBUTES = ("Combat_Load", "Stress_Level", "Fatigue_Level", "Recent_Failure_Count", "Relationship_Strength")
+# Categorical attributes mirrored as int32 code columns (value -> small int code, -1 = unset)
+KG_CODED_ATTRIBUTES = ("Status",)
+KG_COLUMN_INITIAL_CAPACITY = 1024
+# SRE memo of condition results keyed by (rule_id, entity UID, attribute version); LRU-bounded
+SRE_CONDITION_CACHE_SIZE = 1000000
+# Errors from a rule's own logic that skip the entity instead of aborting the cycle
+SRE_RECOVERABLE_ERRORS = (KeyError, AttributeError, TypeError)
+SRE_CRITICAL_PRIORITY = 90 # Axioms at or above this priority are critical (run first, warn when triggered)
+# Optional process-pool evaluation of scalar axioms (off by default: actions must still run serially)
+SRE_PARALLEL_MIN_CANDIDATES = 50000 # Below this the pickling cost outweighs the parallel speedup
+SRE_PARALLEL_CHUNK_SIZE = 10000
 
 # --- 2. BASE DATA STRUCTURES FOR KNOWLEDGE GRAPH (KG) ---
 
+class _UidAllocator:
+    """
+    Monotonic integer UID source (next() on itertools.count is atomic under the GIL).
+    UIDs are small ints in memory and only become strings at the JSON boundary.
+    """
+    __slots__ = ("_floor", "_counter")
+    def __init__(self, start: int = 1):
+        self._floor = start
+        self._counter = itertools.count(start)
+
+    def allocate(self) -> int:
+        return next(self._counter)
+
+    def reserve(self, uid: int):
+        """Makes sure an explicitly supplied UID (e.g. from a snapshot) is never allocated again."""
+        if uid >= self._floor:
+            self._floor = max(uid + 1, next(self._counter))
+            self._counter = itertools.count(self._floor)
+
 class Entity:
     """
     Represents any real-world object or concept in Kivotos (Student, Location, Faction).
     This forms the 'Nodes' of the Knowledge Graph.
     """
-    def __init__(self, name: str, entity_type: str, uid: Optional[str] = None):
-        self.uid = uid if uid else str(uuid.uuid4())
+    # No per-instance __dict__: entities are created by the millions
+    __slots__ = ("uid", "name", "entity_type", "attributes", "creation_time", "_kgm")
+    _uids = _UidAllocator()
+
+    def __init__(self, name: str, entity_type: str, uid: Optional[int] = None):
+        if uid is None:
+            uid = Entity._uids.allocate()
+        elif isinstance(uid, int):
+            Entity._uids.reserve(uid)
+        self.uid = uid
         self.name = name
-        self.entity_type = entity_type
+        # Type names and attribute keys are interned: a small shared vocabulary, so '==' is mostly a pointer check
+        self.entity_type = sys.intern(entity_type)
         # Attributes store dynamic/static properties (e.g., Health, Location, Stress_Level)
         self.attributes: Dict[str, Any] = {}
         self.creation_time = time.time()
+        # The graph that owns this entity (set by add_entity) so its indexes follow attribute changes
+        self._kgm: Optional["KnowledgeGraphManager"] = None
 
     def set_attribute(self, key: str, value: Any):
         """Sets or updates an attribute of the entity."""
+        key = sys.intern(key)
+        old_value = self.attributes.get(key)
         self.attributes[key] = value
+        if self._kgm is not None:
+            self._kgm._on_attribute_set(self, key, old_value, value)
 
     def get_attribute(self, key: str) -> Optional[Any]:
         """Retrieves an attribute value."""
@@ -61,11 +131,18 @@ class Relationship:
     Represents the connection between two Entities.
     This forms the 'Edges' of the Knowledge Graph.
     """
-    def __init__(self, source_uid: str, target_uid: str, relation_type: str, strength: float = 1.0):
-        self.uid = str(uuid.uuid4())
+    __slots__ = ("uid", "source_uid", "target_uid", "relation_type", "strength")
+    _uids = _UidAllocator()
+
+    def __init__(self, source_uid: int, target_uid: int, relation_type: str, strength: float = 1.0, uid: Optional[int] = None):
+        if uid is None:
+            uid = Relationship._uids.allocate()
+        elif isinstance(uid, int):
+            Relationship._uids.reserve(uid)
+        self.uid = uid
         self.source_uid = source_uid
         self.target_uid = target_uid
-        self.relation_type = relation_type
+        self.relation_type = sys.intern(relation_type)
         # Strength: Numerical value indicating certainty or intensity (0.0 to 1.0)
         self.strength = strength
 
@@ -79,6 +156,55 @@ class Relationship:
             "strength": self.strength
         }
 
+def _grow_column(column: np.ndarray, fill) -> np.ndarray:
+    """Returns a copy of column with double the capacity, new slots set to fill."""
+    grown = np.full(len(column) * 2, fill, dtype=column.dtype)
+    grown[:len(column)] = column
+    return grown
+
+def _column_value(value: Any) -> float:
+    """Converts an attribute value to its column representation (non-numeric values read as unset)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    return np.nan
+
+def _is_hashable(value: Any) -> bool:
+    """True if value can key the attribute index and code vocabularies (dict/list values cannot)."""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+def _encode_json(data: Any, pretty: bool = False) -> bytes:
+    """Encodes data to JSON bytes (compact by default; pretty=True indents for humans)."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+def _decode_json(raw) -> Any:
+    """Decodes JSON bytes (or any bytes-like buffer, e.g. a memoryview) produced by _encode_json."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(bytes(raw) if isinstance(raw, memoryview) else raw)
+
+def _decode_json_file(filepath: str) -> Any:
+    """
+    Decodes a JSON file through a read-only memory map: no read() copies into Python,
+    the OS pages the snapshot in on demand while the decoder walks it.
+    """
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            return _decode_json(b"") # mmap refuses empty files; let the decoder report it
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return _decode_json(view)
+    finally:
+        os.close(fd)
+
 # --- 3. KNOWLEDGE GRAPH MANAGER (KGM) ---
 
 class KnowledgeGraphManager:
@@ -88,148 +214,526 @@ class KnowledgeGraphManager:
     """
     def __init__(self, core_id: str):
         self.core_id = core_id
-        self.entities: Dict[str, Entity] = {}      # Key: Entity UID
-        self.relationships: Dict[str, Relationship] = {} # Key: Relationship UID
-        self.entity_name_map: Dict[str, str] = {}  # Map: Name -> UID (for quick lookup)
+        self.entities: Dict[int, Entity] = {}      # Key: Entity UID
+        self.relationships: Dict[int, Relationship] = {} # Key: Relationship UID
+        self.entity_name_map: Dict[str, int] = {}  # Map: Name -> UID (for quick lookup)
+        self._entity_by_name: Dict[str, Entity] = {}  # Name -> Entity directly (hub lookups skip the UID hop)
+        # Attribute version per entity UID, bumped on every set_attribute (lets the SRE memoize conditions)
+        self.attr_version: Dict[int, int] = defaultdict(int)
+        # Type buckets: entity_type -> {UID: Entity} (rules only visit entities of the type they target)
+        self.entities_by_type: Dict[str, Dict[int, Entity]] = {}
+        # Predicate index for KG_INDEXED_ATTRIBUTES: (key, value) -> UIDs
+        self.entities_by_attr: Dict[Tuple[str, Any], Set[int]] = defaultdict(set)
+        # Adjacency index: Entity UID -> Relationship UIDs (lookups cost O(degree) instead of O(all relationships))
+        self.outgoing: Dict[int, List[int]] = defaultdict(list)
+        self.incoming: Dict[int, List[int]] = defaultdict(list)
+        # Typed adjacency index: (Entity UID, relation_type) -> Relationship UIDs (both directions)
+        self.typed_edges: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+        # Column store (SoA) for KG_COLUMN_ATTRIBUTES: row i of every column belongs to row_entities[i]
+        self.uid_to_row: Dict[int, int] = {}
+        self.row_entities: List[Entity] = []
+        self.attr_columns: Dict[str, np.ndarray] = {
+            key: np.full(KG_COLUMN_INITIAL_CAPACITY, np.nan) for key in KG_COLUMN_ATTRIBUTES
+        }
+        # Code columns for KG_CODED_ATTRIBUTES plus the entity type column, with their value -> code vocabularies
+        self.code_columns: Dict[str, np.ndarray] = {
+            key: np.full(KG_COLUMN_INITIAL_CAPACITY, -1, dtype=np.int32) for key in KG_CODED_ATTRIBUTES
+        }
+        self.type_column = np.full(KG_COLUMN_INITIAL_CAPACITY, -1, dtype=np.int32)
+        self._value_codes: Dict[str, Dict[Any, int]] = defaultdict(dict)
+        self._type_codes: Dict[str, int] = {}
         self.total_entities = 0
         self.total_relationships = 0
-        print(f"[KGM] Knowledge Graph Manager initialized for core: {core_id}")
+        # Write-ahead log of (op, payload) deltas not yet flushed to disk. Off until the graph is bound
+        # to a snapshot file (first save/load): before that, a save writes the full snapshot anyway.
+        self._wal: List[Tuple[str, Dict[str, Any]]] = []
+        self._wal_enabled = False
+        self.snapshot_interval = KG_SNAPSHOT_INTERVAL
+        self._snapshot_path: Optional[str] = None
+        self._last_snapshot_time = 0.0
+        logger.info("[KGM] Knowledge Graph Manager initialized for core: %s", core_id)
 
     # --- Entity Management Methods ---
 
     def add_entity(self, entity: Entity) -> bool:
         """Adds a new entity to the graph."""
-        if self.total_entities >= KG_ENTITY_LIMIT:
-            print("[KGM ERROR] Entity limit reached.")
+        if (self.total_entities & KG_LIMIT_CHECK_MASK) == 0 and self.total_entities >= KG_ENTITY_LIMIT:
+            logger.error("[KGM ERROR] Entity limit reached.")
             return False
         
-        if entity.uid in self.entities or entity.name in self.entity_name_map:
-            print(f"[KGM WARNING] Entity '{entity.name}' already exists.")
+        # Existence check and insert in one hash per key (setdefault leaves the size unchanged on a clash)
+        entities = self.entities
+        known = len(entities)
+        entities.setdefault(entity.uid, entity)
+        if len(entities) == known:
+            logger.warning("[KGM WARNING] Entity '%s' already exists.", entity.name)
+            return False
+        by_name = self._entity_by_name
+        known = len(by_name)
+        by_name.setdefault(entity.name, entity)
+        if len(by_name) == known:
+            del entities[entity.uid]
+            logger.warning("[KGM WARNING] Entity '%s' already exists.", entity.name)
             return False
 
-        self.entities[entity.uid] = entity
-        self.entity_name_map[entity.name] = entity.uid
+        self._index_entity(entity)
         self.total_entities += 1
         return True
 
-    def get_entity_by_uid(self, uid: str) -> Optional[Entity]:
+    def _add_entity_unchecked(self, entity: Entity):
+        """
+        Bulk-load path: inserts without limit/duplicate checks or logging (the source is trusted,
+        e.g. our own snapshot). The caller updates total_entities.
+        """
+        self.entities[entity.uid] = entity
+        self._entity_by_name[entity.name] = entity
+        self._index_entity(entity)
+
+    def _index_entity(self, entity: Entity):
+        """Mutation tail shared by the add paths: name map, type bucket, attribute index, column row, WAL."""
+        self.entity_name_map[entity.name] = entity.uid
+        self.entities_by_type.setdefault(entity.entity_type, {})[entity.uid] = entity
+        for key in KG_INDEXED_ATTRIBUTES:
+            if key in entity.attributes and _is_hashable(entity.attributes[key]):
+                self.entities_by_attr[(key, entity.attributes[key])].add(entity.uid)
+        self._allocate_row(entity)
+        entity._kgm = self
+        if self._wal_enabled:
+            ent_data = entity.to_dict()
+            ent_data["attributes"] = dict(ent_data["attributes"])
+            self._record("add_entity", ent_data)
+
+    def _on_attribute_set(self, entity: Entity, key: str, old_value: Any, new_value: Any):
+        """Keeps the attribute indexes and the WAL in sync when an owned entity changes (called by Entity.set_attribute)."""
+        if self._wal_enabled:
+            self._record("set_attribute", {"uid": entity.uid, "key": key, "value": new_value})
+        self.attr_version[entity.uid] += 1
+        if key in KG_INDEXED_ATTRIBUTES:
+            # Unhashable values (dict/list) are never indexed
+            old_bucket = self.entities_by_attr.get((key, old_value)) if _is_hashable(old_value) else None
+            if old_bucket is not None:
+                old_bucket.discard(entity.uid)
+            if _is_hashable(new_value):
+                self.entities_by_attr[(key, new_value)].add(entity.uid)
+        if key in self.attr_columns:
+            self.attr_columns[key][self.uid_to_row[entity.uid]] = _column_value(new_value)
+        elif key in self.code_columns:
+            self.code_columns[key][self.uid_to_row[entity.uid]] = self.value_code(key, new_value)
+
+    # --- Column Store (SoA) Methods ---
+
+    def _allocate_row(self, entity: Entity):
+        """Gives the entity a row in every column (doubling capacity when full) and copies its hot attributes in."""
+        row = len(self.row_entities)
+        if row == len(self.type_column):
+            self.attr_columns = {key: _grow_column(column, np.nan) for key, column in self.attr_columns.items()}
+            self.code_columns = {key: _grow_column(column, -1) for key, column in self.code_columns.items()}
+            self.type_column = _grow_column(self.type_column, -1)
+        self.uid_to_row[entity.uid] = row
+        self.row_entities.append(entity)
+        attributes = entity.attributes
+        for key, column in self.attr_columns.items():
+            if key in attributes:
+                column[row] = _column_value(attributes[key])
+        for key, column in self.code_columns.items():
+            if key in attributes:
+                column[row] = self.value_code(key, attributes[key])
+        self.type_column[row] = self.type_code(entity.entity_type)
+
+    def value_code(self, key: str, value: Any) -> int:
+        """Returns the int code of a categorical attribute value (allocated on first use; None/unhashable -> -1)."""
+        if value is None or not _is_hashable(value):
+            return -1
+        codes = self._value_codes[key]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(codes)
+        return code
+
+    def type_code(self, entity_type: str) -> int:
+        """Returns the int code of an entity type (allocated on first use)."""
+        code = self._type_codes.get(entity_type)
+        if code is None:
+            code = self._type_codes[entity_type] = len(self._type_codes)
+        return code
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Returns live views (used rows only) of every numeric and code column, keyed by attribute."""
+        n = len(self.row_entities)
+        views = {key: column[:n] for key, column in self.attr_columns.items()}
+        for key, column in self.code_columns.items():
+            views[key] = column[:n]
+        return views
+
+    def type_mask(self, entity_type: str) -> np.ndarray:
+        """Boolean mask (used rows only) of the rows holding entities of entity_type."""
+        return self.type_column[:len(self.row_entities)] == self.type_code(entity_type)
+
+    def column(self, key: str) -> np.ndarray:
+        """Returns the live (used rows only) view of a hot attribute column."""
+        return self.attr_columns[key][:len(self.row_entities)]
+
+    def entities_at_rows(self, rows) -> List[Entity]:
+        """Maps column row indices (e.g. from np.flatnonzero) back to entities."""
+        row_entities = self.row_entities
+        return [row_entities[row] for row in rows]
+
+    def get_entities_by_type(self, entity_type: str) -> List[Entity]:
+        """Retrieves all entities of one type (from the type bucket, no full scan)."""
+        return list(self.entities_by_type.get(entity_type, {}).values())
+
+    def get_entities_with_attribute(self, key: str, value: Any) -> List[Entity]:
+        """Retrieves entities whose indexed attribute equals value (key must be in KG_INDEXED_ATTRIBUTES)."""
+        if not _is_hashable(value):
+            return []
+        return [self.entities[uid] for uid in self.entities_by_attr.get((key, value), ())]
+
+    def get_entity_by_uid(self, uid: int) -> Optional[Entity]:
         """Retrieves an entity by its UID."""
         return self.entities.get(uid)
 
     def get_entity_by_name(self, name: str) -> Optional[Entity]:
         """Retrieves an entity by its name (faster lookup)."""
-        uid = self.entity_name_map.get(name)
-        return self.get_entity_by_uid(uid) if uid else None
+        return self._entity_by_name.get(name)
 
     # --- Relationship Management Methods ---
 
     def add_relationship(self, relationship: Relationship) -> bool:
         """Adds a new relationship (edge) to the graph."""
-        if self.total_relationships >= KG_RELATION_LIMIT:
-            print("[KGM ERROR] Relationship limit reached.")
+        if (self.total_relationships & KG_LIMIT_CHECK_MASK) == 0 and self.total_relationships >= KG_RELATION_LIMIT:
+            logger.error("[KGM ERROR] Relationship limit reached.")
             return False
 
         if relationship.source_uid not in self.entities or relationship.target_uid not in self.entities:
-            print("[KGM ERROR] Source or target entity does not exist for relationship.")
+            logger.error("[KGM ERROR] Source or target entity does not exist for relationship.")
             return False
 
-        self.relationships[relationship.uid] = relationship
+        if relationship.uid in self.relationships:
+            logger.warning("[KGM WARNING] Relationship %s already exists.", relationship.uid)
+            return False
+
+        self._add_relationship_unchecked(relationship)
         self.total_relationships += 1
         return True
 
-    def get_relationships_for_entity(self, uid: str, relation_type: Optional[str] = None) -> List[Relationship]:
-        """Finds all relationships connected to a specific entity UID."""
+    def _add_relationship_unchecked(self, relationship: Relationship):
+        """Bulk-load path: inserts without limit/endpoint checks or logging. The caller updates total_relationships."""
+        self.relationships[relationship.uid] = relationship
+        self.outgoing[relationship.source_uid].append(relationship.uid)
+        self.incoming[relationship.target_uid].append(relationship.uid)
+        self.typed_edges[(relationship.source_uid, relationship.relation_type)].append(relationship.uid)
+        if relationship.target_uid != relationship.source_uid:
+            self.typed_edges[(relationship.target_uid, relationship.relation_type)].append(relationship.uid)
+        self._record("add_relationship", relationship.to_dict())
+
+    def get_relationships_for_entity(self, uid: int, relation_type: Optional[str] = None) -> List[Relationship]:
+        """Finds all relationships connected to a specific entity UID (via the adjacency index)."""
+        if relation_type is not None:
+            return [self.relationships[rid] for rid in self.typed_edges.get((uid, relation_type), ())]
+
+        # A self-loop appears in both lists; report it once
+        seen = set()
         found_relationships = []
-        for rel in self.relationships.values():
-            if rel.source_uid == uid or rel.target_uid == uid:
-                if relation_type is None or rel.relation_type == relation_type:
-                    found_relationships.append(rel)
+        for rid in chain(self.outgoing.get(uid, ()), self.incoming.get(uid, ())):
+            if rid not in seen:
+                seen.add(rid)
+                found_relationships.append(self.relationships[rid])
         return found_relationships
     
     # --- Persistence Methods (Placeholder for File I/O on ROG Ally SSD) ---
-    
-    def save_to_disk(self, filepath: str = "arona_kg_data.json"):
-        """Saves the entire graph data structure to disk."""
-        data = {
-            "entities": {uid: entity.to_dict() for uid, entity in self.entities.items()},
-            "relationships": {uid: rel.to_dict() for uid, rel in self.relationships.items()}
+    # Snapshot + write-ahead log: changes are recorded as deltas and appended to '<snapshot>.log';
+    # the full snapshot is only rewritten (compacted) at most once per snapshot_interval.
+
+    def _record(self, op: str, payload: Dict[str, Any]):
+        """Appends one delta to the in-memory write log (skipped while unbound or loading/replaying)."""
+        if self._wal_enabled:
+            self._wal.append((op, payload))
+
+    def _snapshot_data(self) -> Dict[str, Any]:
+        """Builds the serializable snapshot of the whole graph (JSON object keys must be strings)."""
+        return {
+            "entities": {str(uid): entity.to_dict() for uid, entity in self.entities.items()},
+            "relationships": {str(uid): rel.to_dict() for uid, rel in self.relationships.items()}
         }
+
+    def _write_snapshot(self, filepath: str, pretty: bool = False) -> bool:
+        """Writes the full snapshot in a single write call."""
+        try:
+            payload = _encode_json(self._snapshot_data(), pretty=pretty)
+            with open(filepath, 'wb') as f:
+                f.write(payload)
+            logger.info("[KGM INFO] Knowledge Graph saved successfully to %s", filepath)
+            return True
+        except IOError as e:
+            logger.error("[KGM FATAL ERROR] Could not save graph: %s", e)
+            return False
+
+    def flush_wal(self, wal_path: str) -> int:
+        """Appends the pending deltas to the WAL file (one JSON line each). Returns the number written."""
+        if not self._wal:
+            return 0
+        lines = b"".join(_encode_json([op, payload]) + b"\n" for op, payload in self._wal)
+        try:
+            with open(wal_path, 'ab') as f:
+                f.write(lines)
+        except IOError as e:
+            logger.error("[KGM FATAL ERROR] Could not append write log: %s", e)
+            return 0
+        written = len(self._wal)
+        self._wal.clear()
+        return written
+
+    def compact(self, filepath: str = "arona_kg_data.json") -> bool:
+        """Writes a fresh snapshot and truncates its WAL (pending deltas are folded into the snapshot)."""
+        if not self._write_snapshot(filepath):
+            return False
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
-            print(f"[KGM INFO] Knowledge Graph saved successfully to {filepath}")
+            open(filepath + KG_WAL_SUFFIX, 'wb').close()
         except IOError as e:
-            print(f"[KGM FATAL ERROR] Could not save graph: {e}")
+            logger.error("[KGM FATAL ERROR] Could not truncate write log: %s", e)
+        self._wal.clear()
+        self._snapshot_path = filepath
+        self._last_snapshot_time = time.monotonic()
+        self._wal_enabled = True # Bound to a snapshot: later changes are logged as deltas
+        return True
+
+    def save_to_disk(self, filepath: str = "arona_kg_data.json", force: bool = False):
+        """
+        Saves the graph to disk. Within snapshot_interval of the last snapshot of the same file,
+        only the pending deltas are appended to the WAL (O(changes)); otherwise the snapshot is compacted.
+        """
+        if (not force and self._snapshot_path == filepath
+                and time.monotonic() - self._last_snapshot_time < self.snapshot_interval):
+            self.flush_wal(filepath + KG_WAL_SUFFIX)
+            return
+        self.compact(filepath)
+
+    def save_pretty(self, filepath: str = "arona_kg_data.pretty.json"):
+        """Debugging entry point: writes an indented, human-readable snapshot (does not touch the WAL)."""
+        self._write_snapshot(filepath, pretty=True)
+
+    @staticmethod
+    def _entity_from_dict(ent_data: Dict[str, Any]) -> Entity:
+        """Rebuilds one entity from its serialized form."""
+        entity = Entity(ent_data['name'], ent_data['entity_type'], uid=ent_data['uid'])
+        entity.attributes = {sys.intern(key): value for key, value in ent_data['attributes'].items()}
+        return entity
+
+    @staticmethod
+    def _relationship_from_dict(rel_data: Dict[str, Any]) -> Relationship:
+        """Rebuilds one relationship from its serialized form."""
+        return Relationship(rel_data['source'], rel_data['target'], rel_data['type'], rel_data['strength'], uid=rel_data['uid'])
+
+    def _load_entity(self, ent_data: Dict[str, Any]):
+        """Rebuilds one entity and adds it through the checked path."""
+        self.add_entity(self._entity_from_dict(ent_data)) # Note: add_entity handles mapping
+
+    def _load_relationship(self, rel_data: Dict[str, Any]):
+        """Rebuilds one relationship and adds it through the checked path."""
+        self.add_relationship(self._relationship_from_dict(rel_data)) # Note: add_relationship validates entities
+
+    def _replay_wal(self, wal_path: str) -> int:
+        """Re-applies the deltas recorded after the snapshot. Returns the number replayed."""
+        try:
+            with open(wal_path, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return 0
+
+        for line in lines:
+            op, payload = _decode_json(line)
+            if op == "add_entity":
+                self._load_entity(payload)
+            elif op == "add_relationship":
+                self._load_relationship(payload)
+            elif op == "set_attribute":
+                entity = self.entities.get(payload['uid'])
+                if entity is not None:
+                    entity.set_attribute(payload['key'], payload['value'])
+        return len(lines)
 
     def load_from_disk(self, filepath: str = "arona_kg_data.json") -> bool:
-        """Loads the entire graph data structure from disk."""
+        """Loads the graph snapshot from disk, then replays its WAL."""
+        self._wal_enabled = False
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _decode_json_file(filepath)
+            entities_data = data.get("entities", {})
+            relationships_data = data.get("relationships", {})
             
-            # Load Entities
-            for uid, ent_data in data.get("entities", {}).items():
-                entity = Entity(ent_data['name'], ent_data['entity_type'], uid=uid)
-                entity.attributes = ent_data['attributes']
-                self.add_entity(entity) # Note: add_entity handles mapping
+            if not self.entities and not self.relationships:
+                # Fresh graph: trust the snapshot and take the unchecked bulk path
+                for ent_data in entities_data.values():
+                    self._add_entity_unchecked(self._entity_from_dict(ent_data))
+                self.total_entities += len(entities_data)
+                for rel_data in relationships_data.values():
+                    self._add_relationship_unchecked(self._relationship_from_dict(rel_data))
+                self.total_relationships += len(relationships_data)
+            else:
+                # Merging into a live graph: keep the duplicate/endpoint checks
+                for ent_data in entities_data.values():
+                    self._load_entity(ent_data)
+                for rel_data in relationships_data.values():
+                    self._load_relationship(rel_data)
+
+            replayed = self._replay_wal(filepath + KG_WAL_SUFFIX)
+            self._snapshot_path = filepath
+            self._last_snapshot_time = time.monotonic()
                 
-            # Load Relationships
-            for uid, rel_data in data.get("relationships", {}).items():
-                rel = Relationship(rel_data['source'], rel_data['target'], rel_data['type'], rel_data['strength'])
-                self.add_relationship(rel) # Note: add_relationship validates entities
-                
-            print(f"[KGM INFO] Knowledge Graph loaded successfully. Entities: {self.total_entities}, Relationships: {self.total_relationships}")
+            logger.info("[KGM INFO] Knowledge Graph loaded successfully. Entities: %d, Relationships: %d, WAL entries replayed: %d",
+                        self.total_entities, self.total_relationships, replayed)
             return True
         except FileNotFoundError:
-            print("[KGM INFO] Data file not found. Starting with empty graph.")
+            logger.info("[KGM INFO] Data file not found. Starting with empty graph.")
             return False
         except Exception as e:
-            print(f"[KGM FATAL ERROR] Failed to load graph data: {e}")
+            logger.error("[KGM FATAL ERROR] Failed to load graph data: %s", e)
             return False
+        finally:
+            # Log deltas only once bound to a snapshot file (a missing/failed load leaves the graph unbound)
+            self._wal_enabled = self._snapshot_path is not None
 
 # --- 4. SYMBOLIC REASONING ENGINE (SRE) ---
 
+def _predicate_holds(op, value, constant) -> bool:
+    """
+    Evaluates one bound predicate on a scalar attribute value. Unset values and
+    type-mismatched compares (e.g. a str ordered against a number) do not match.
+    """
+    if value is None:
+        return False
+    try:
+        return bool(op(value, constant))
+    except TypeError:
+        return False
+
+def _match_predicates_chunk(predicates: tuple, rows: List[Tuple[int, Dict[str, Any]]]) -> List[int]:
+    """Process-pool worker: returns the UIDs of the (uid, attributes) rows that satisfy every predicate."""
+    matched = []
+    for uid, attributes in rows:
+        for key, op, constant in predicates:
+            if not _predicate_holds(op, attributes.get(key), constant):
+                break
+        else:
+            matched.append(uid)
+    return matched
+
+# Predicate operators for declarative axiom specs. The same callables work on a scalar
+# attribute value and on a whole numpy column (where they return a boolean mask).
+PREDICATE_OPERATORS = {
+    ">": operator.gt, ">=": operator.ge,
+    "<": operator.lt, "<=": operator.le,
+    "==": operator.eq, "!=": operator.ne,
+}
+# Operators that may be evaluated on a column (NaN = unset never satisfies an ordering compare)
+COLUMN_OPERATORS = (">", ">=", "<", "<=")
+
 class SymbolicReasoningEngine:
     """
     The core logical processor for A.R.O.N.A. It applies predefined rules (axioms) 
     to the Knowledge Graph to derive new facts or make decisions.
     """
-    def __init__(self, kgm: KnowledgeGraphManager):
+    def __init__(self, kgm: KnowledgeGraphManager, parallel_workers: int = 0):
         self.kgm = kgm
         # Axioms: The predefined rules of Kivotos (Tactic, Social, Physics)
-        # Format: (Rule ID, Condition Function, Action Function, Priority)
+        # Format: (Rule ID, Target Entity Type, Condition Function, Action Function, Priority, Vector Condition)
+        # Vector Condition (optional) evaluates the rule over the column store as one mask; Condition Function is the per-entity fallback
         self.axioms: List[tuple] = []
+        # Priority tiers of self.axioms (sorted, split once at load): critical prefix and the rest
+        self.critical_axioms: List[tuple] = []
+        self.normal_axioms: List[tuple] = []
+        # Memoized results of compiled conditions: (rule_id, UID, attribute version) -> bool (unchanged entities skip
+        # re-evaluation). Only compiled predicates read nothing but the entity's own attributes, so only they are memoized.
+        self._cond_cache: OrderedDict = OrderedDict()
+        # parallel_workers > 0 evaluates large scalar axioms on a process pool (read phase only)
+        self.parallel_workers = parallel_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
         self.load_initial_axioms()
-        print("[SRE] Symbolic Reasoning Engine initialized.")
+        logger.info("[SRE] Symbolic Reasoning Engine initialized.")
+
+    def compile_axiom(self, spec: Dict[str, Any]) -> tuple:
+        """
+        Compiles a declarative axiom spec into the axiom tuple format.
+        Spec: {"rule_id", "target_type", "predicates": [(attribute_key, op, constant), ...], "action", "priority"}
+        Always produces a scalar condition closure (keys and constants bound). When every predicate can run
+        on the column store, also produces vector_condition(columns) -> bool mask for the whole graph.
+        """
+        target_type = spec["target_type"]
+        predicates = tuple((key, PREDICATE_OPERATORS[op_name], constant) for key, op_name, constant in spec.get("predicates", ()))
+
+        # Scalar form (fallback); the bound predicates stay reachable for the process-pool path
+        if len(predicates) == 1:
+            key, op, constant = predicates[0]
+
+            def condition_func(entity: Entity) -> bool:
+                return _predicate_holds(op, entity.attributes.get(key), constant)
+        else:
+            def condition_func(entity: Entity) -> bool:
+                attributes = entity.attributes
+                for key, op, constant in predicates:
+                    if not _predicate_holds(op, attributes.get(key), constant):
+                        return False
+                return True
+        condition_func.predicates = predicates
+        # Lookup-and-compare that cannot raise (type mismatches count as no match):
+        # evaluated without a per-entity try frame
+        condition_func.safe = True
+
+        # Vector form: numeric ordering compares on value columns, (in)equality on code columns
+        column_preds = []
+        for (key, op_name, constant), (_, op, _) in zip(spec.get("predicates", ()), predicates):
+            if key in KG_COLUMN_ATTRIBUTES and op_name in COLUMN_OPERATORS and isinstance(constant, (int, float)):
+                column_preds.append((key, op, constant, False))
+            elif key in KG_CODED_ATTRIBUTES and op_name in ("==", "!=") and constant is not None and _is_hashable(constant):
+                column_preds.append((key, op, self.kgm.value_code(key, constant), op_name == "!="))
+            else:
+                column_preds = None
+                break
+
+        vector_condition = None
+        if column_preds:
+            bound_columns = tuple(column_preds)
+
+            def vector_condition(columns: Dict[str, np.ndarray]) -> np.ndarray:
+                mask = None
+                for key, op, constant, exclude_unset in bound_columns:
+                    column = columns[key]
+                    term = op(column, constant)
+                    if exclude_unset:
+                        term &= column >= 0
+                    mask = term if mask is None else (mask & term)
+                return mask
+
+        return (spec["rule_id"], target_type, condition_func, spec["action"], spec["priority"], vector_condition)
 
     def load_initial_axioms(self):
         """Loads critical, foundational rules (Axioms) into the engine."""
         
         # RULE AXIOM 1: Tactical Deployment Priority (Tactic)
         # Condition: Find any active 'Combat_Event' that is 'Unresolved'
-        def condition_tactical_alert(event: Entity):
-            return event.entity_type == "Combat_Event" and event.get_attribute("Status") == "Unresolved"
-
         # Action: Determine the best initial deployment based on threat type
         def action_determine_deployment(event: Entity):
             threat_type = event.get_attribute("Threat_Type")
             if threat_type == "Heavy_Armor":
                 # Inference: Deploy students with 'Penetration' attribute
-                print("[SRE INFERENCE] Threat: Heavy Armor. Deployment Rule: Prioritize Penetration.")
+                logger.debug("[SRE INFERENCE] Threat: Heavy Armor. Deployment Rule: Prioritize Penetration.")
                 return {"Decision": "Deployment_Filter", "Filter_Type": "Penetration"}
             if threat_type == "Unidentified":
                 # Inference: Deploy students with highest 'Versatility' score
-                print("[SRE INFERENCE] Threat: Unidentified. Deployment Rule: Prioritize Versatility.")
+                logger.debug("[SRE INFERENCE] Threat: Unidentified. Deployment Rule: Prioritize Versatility.")
                 return {"Decision": "Deployment_Filter", "Filter_Type": "Versatility"}
             return {"Decision": "Standard_Deployment"}
 
-        self.axioms.append(("AXIOM_T1_Deployment", condition_tactical_alert, action_determine_deployment, 90))
+        self.axioms.append(self.compile_axiom({
+            "rule_id": "AXIOM_T1_Deployment",
+            "target_type": "Combat_Event",
+            "predicates": [("Status", "==", "Unresolved")],
+            "action": action_determine_deployment,
+            "priority": 90,
+        }))
         
         # RULE AXIOM 2: Stress Management (Common Sense / Theory of Mind)
         # Condition: Find any 'Student' whose 'Stress_Level' attribute is above 0.8
-        def condition_student_stress(student: Entity):
-            return student.entity_type == "Student" and student.get_attribute("Stress_Level") is not None and student.get_attribute("Stress_Level") > 0.8
-
+        # (vectorized: one compare over the Stress_Level column; unset rows are NaN and never compare true)
         # Action: Reduce student load and recommend non-combat activity
         def action_recommend_rest(student: Entity):
             # Inference: Create a new 'Recommendation' entity in the KG
@@ -240,64 +744,160 @@ class SymbolicReasoningEngine:
             self.kgm.add_entity(recommendation)
             # Update the student entity's status
             student.set_attribute("Combat_Load", 0.1)
-            print(f"[SRE INFERENCE] Student {student.name} is stressed. Load reduced and Cafe Visit recommended.")
+            logger.debug("[SRE INFERENCE] Student %s is stressed. Load reduced and Cafe Visit recommended.", student.name)
             return {"Decision": "Status_Update", "Target": student.name, "New_Load": 0.1}
 
-        self.axioms.append(("AXIOM_CS_Stress", condition_student_stress, action_recommend_rest, 50))
+        self.axioms.append(self.compile_axiom({
+            "rule_id": "AXIOM_CS_Stress",
+            "target_type": "Student",
+            "predicates": [("Stress_Level", ">", 0.8)],
+            "action": action_recommend_rest,
+            "priority": 50,
+        }))
         
-        # Sort axioms by priority (higher number runs first)
-        self.axioms.sort(key=lambda x: x[3], reverse=True)
+        self._sort_axioms()
+
+    def _sort_axioms(self):
+        """Sorts axioms by priority (higher number runs first) and splits off the critical prefix."""
+        self.axioms.sort(key=lambda x: x[4], reverse=True)
+        split = next((i for i, axiom in enumerate(self.axioms) if axiom[4] < SRE_CRITICAL_PRIORITY), len(self.axioms))
+        self.critical_axioms = self.axioms[:split]
+        self.normal_axioms = self.axioms[split:]
 
+    def add_axiom(self, axiom: tuple):
+        """Adds a (compiled) axiom at runtime and refreshes the priority tiers."""
+        self.axioms.append(axiom)
+        self._sort_axioms()
+
+
+    def _match_axiom(self, rule_id: str, target_type: str, condition_func, vector_condition) -> List[Entity]:
+        """
+        Read phase: returns the entities satisfying one axiom, without modifying the graph.
+        Vectorized rules take one mask over the columns; compiled scalar rules use the condition memo,
+        or the process pool when enabled and the type bucket is large enough. Hand-written conditions
+        may read relationships or other entities, so they are evaluated every cycle.
+        """
+        kgm = self.kgm
+        if vector_condition is not None:
+            mask = vector_condition(kgm.columns()) & kgm.type_mask(target_type)
+            return kgm.entities_at_rows(np.flatnonzero(mask))
+
+        bucket = kgm.entities_by_type.get(target_type, {})
+        predicates = getattr(condition_func, "predicates", None)
+        if self.parallel_workers > 0 and predicates is not None and len(bucket) >= SRE_PARALLEL_MIN_CANDIDATES:
+            return self._match_parallel(predicates, bucket)
+
+        if getattr(condition_func, "safe", False):
+            return self._match_memoized(rule_id, condition_func, bucket)
+
+        # Hand-written conditions: a failure skips the entity, not the whole cycle
+        matched_entities = []
+        for entity in bucket.values():
+            try:
+                matched = condition_func(entity)
+            except SRE_RECOVERABLE_ERRORS as e:
+                logger.error("[SRE ERROR] Axiom %s failed on Entity %s: %s", rule_id, entity.name, e)
+                continue
+            if matched:
+                matched_entities.append(entity)
+        return matched_entities
+
+    def _match_memoized(self, rule_id: str, condition_func, bucket: Dict[int, Entity]) -> List[Entity]:
+        """Evaluates a compiled condition over a type bucket, reusing results for entities whose attributes are unchanged."""
+        cond_cache = self._cond_cache
+        attr_version = self.kgm.attr_version
+
+        def cached_condition(entity: Entity) -> bool:
+            # .get: reading must not insert a version entry for every entity visited
+            cache_key = (rule_id, entity.uid, attr_version.get(entity.uid, 0))
+            matched = cond_cache.get(cache_key)
+            if matched is None:
+                matched = bool(condition_func(entity))
+                cond_cache[cache_key] = matched
+                if len(cond_cache) > SRE_CONDITION_CACHE_SIZE:
+                    cond_cache.popitem(last=False)
+            else:
+                cond_cache.move_to_end(cache_key)
+            return matched
+
+        return [entity for entity in bucket.values() if cached_condition(entity)]
+
+    def _match_parallel(self, predicates: tuple, bucket: Dict[int, Entity]) -> List[Entity]:
+        """Evaluates bound predicates over a type bucket in chunks on the process pool."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.parallel_workers)
+        rows = [(uid, entity.attributes) for uid, entity in bucket.items()]
+        chunks = [rows[i:i + SRE_PARALLEL_CHUNK_SIZE] for i in range(0, len(rows), SRE_PARALLEL_CHUNK_SIZE)]
+        matched = []
+        for uids in self._pool.map(_match_predicates_chunk, [predicates] * len(chunks), chunks):
+            matched.extend(bucket[uid] for uid in uids)
+        return matched
+
+    def shutdown(self):
+        """Stops the process pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _run_axiom(self, axiom: tuple, inference_results: List[Dict]) -> int:
+        """Runs one axiom (read phase, then write phase) and returns how many inferences it made."""
+        rule_id, target_type, condition_func, action_func, priority, vector_condition = axiom
+
+        # 2-3. Read phase: find the Entities of the target type that meet the Condition
+        matched_entities = self._match_axiom(rule_id, target_type, condition_func, vector_condition)
+
+        # 4. Write phase: Execute the Action on each match, in order
+        made = 0
+        for entity in matched_entities:
+            try:
+                result = action_func(entity)
+                
+                # 5. Record the Inference Result
+                inference_results.append({
+                    "rule_id": rule_id,
+                    "entity": entity.name,
+                    "action_taken": result
+                })
+                made += 1
+
+            except SRE_RECOVERABLE_ERRORS as e:
+                logger.error("[SRE ERROR] Axiom %s failed on Entity %s: %s", rule_id, entity.name, e)
+                # In a real OS, this would trigger an error report to the main system log
+        return made
 
     def run_inference_cycle(self) -> List[Dict]:
         """
         Executes a single cycle of symbolic reasoning.
         This is the main function that runs constantly in the A.R.O.N.A. loop.
+        Each axiom runs a read phase (find matches) and then a serial write phase (actions),
+        so actions never mutate the graph while it is being scanned.
         """
         inference_results = []
         start_time = time.time()
         
-        # 1. Iterate through all Axioms (Rules) based on Priority
-        for rule_id, condition_func, action_func, priority in self.axioms:
-            
-            # 2. Iterate through all Entities in the Knowledge Graph
-            for entity in self.kgm.entities.values():
-                
-                # 3. Check if the Condition of the Rule is Met by the Entity
-                try:
-                    if condition_func(entity):
-                        # 4. If Condition is Met, Execute the Action
-                        result = action_func(entity)
-                        
-                        # 5. Record the Inference Result
-                        inference_results.append({
-                            "rule_id": rule_id,
-                            "entity": entity.name,
-                            "action_taken": result
-                        })
-                        
-                        # Critical rules (High Priority) might stop further lower-priority processing
-                        if priority >= 90: 
-                            print(f"[SRE WARNING] Critical Rule {rule_id} triggered. May halt subsequent low-priority checks.")
-                            # break # Optional: Uncomment to stop on critical rules
-
-                except Exception as e:
-                    print(f"[SRE ERROR] Axiom {rule_id} failed on Entity {entity.name}: {e}")
-                    # In a real OS, this would trigger an error report to the main system log
+        # 1. Iterate through all Axioms (Rules) based on Priority: critical tier first
+        for axiom in self.critical_axioms:
+            if self._run_axiom(axiom, inference_results):
+                # Critical rules (High Priority) might stop further lower-priority processing
+                logger.warning("[SRE WARNING] Critical Rule %s triggered. May halt subsequent low-priority checks.", axiom[0])
+                # break # Optional: Uncomment to stop on critical rules
+
+        for axiom in self.normal_axioms:
+            self._run_axiom(axiom, inference_results)
         
         end_time = time.time()
-        print(f"[SRE CYCLE END] Cycle completed in {end_time - start_time:.4f} seconds. {len(inference_results)} inferences made.")
+        logger.info("[SRE CYCLE END] Cycle completed in %.4f seconds. %d inferences made.", end_time - start_time, len(inference_results))
         return inference_results
 
 # --- 5. EXECUTION EXAMPLE (Demonstration) ---
 # This section demonstrates how the Core works by adding mock data (Students and Events)
 
-def initialize_arona_core_logic():
+def initialize_arona_core_logic(parallel_workers: int = 0):
     """Initial setup and demonstration of the ARONA AGI Core."""
     
     # 1. Initialize Managers
     kg_manager = KnowledgeGraphManager(ARONA_CORE_ID)
-    sre_engine = SymbolicReasoningEngine(kg_manager)
+    sre_engine = SymbolicReasoningEngine(kg_manager, parallel_workers=parallel_workers)
     
     # 2. Add Initial Entities (Students and an Event)
     
@@ -363,5 +963,13 @@ def initialize_arona_core_logic():
 # --- Main Execution Point (This would be run by the Kernel's init system) ---
 
 if __name__ == "__main__":
-    initialize_arona_core_logic()
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+    # --parallel-sre[=N]: evaluate large scalar axioms on N worker processes (default: CPU count)
+    parallel_workers = 0
+    for arg in sys.argv[1:]:
+        if arg == "--parallel-sre":
+            parallel_workers = os.cpu_count() or 1
+        elif arg.startswith("--parallel-sre="):
+            parallel_workers = int(arg.split("=", 1)[1])
+    initialize_arona_core_logic(parallel_workers)
 
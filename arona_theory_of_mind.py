@@ -12,10 +12,16 @@
 # =========================================================================
 
 import time
+import bisect
+import logging
 import random
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
 
+# Logger ของโมดูล (เงียบโดยค่าเริ่มต้น จนกว่าโปรแกรมหลักจะตั้งค่า Handler)
+logger = logging.getLogger("arona.tom")
+logger.addHandler(logging.NullHandler())
+
 # --- 1. CONFIGURATION AND CORE STRUCTURES ---
 
 # Assume core definition from previous parts
@@ -31,12 +37,60 @@ class EmotionalState(Enum):
     DETERMINED = 7 # มุ่งมั่น (เชิงบวก)
 
 # Factors influencing emotional state
+W_LOAD = 0.3  # ภาระการรบ (ยิ่งสูงยิ่งเครียด)
+W_FAIL = 0.4  # ความล้มเหลวเร็วๆ นี้
+W_REL = 0.2   # ความสัมพันธ์ในทีม (ยิ่งสูงยิ่งมั่นใจ)
+W_FAT = 0.1   # ระดับความเหนื่อยล้า
+
+# ใช้สำหรับดู/ส่งออกค่า Config เท่านั้น (Kernel อ่านค่าคงที่ W_* ด้านบนโดยตรง)
 EMOTION_FACTOR_WEIGHTS = {
-    "Combat_Load": 0.3,      # ภาระการรบ (ยิ่งสูงยิ่งเครียด)
-    "Recent_Failure_Count": 0.4, # ความล้มเหลวเร็วๆ นี้
-    "Relationship_Strength": 0.2, # ความสัมพันธ์ในทีม (ยิ่งสูงยิ่งมั่นใจ)
-    "Fatigue_Level": 0.1       # ระดับความเหนื่อยล้า
+    "Combat_Load": W_LOAD,
+    "Recent_Failure_Count": W_FAIL,
+    "Relationship_Strength": W_REL,
+    "Fatigue_Level": W_FAT
+}
+
+def compute_emotion_score(load: float, failures: float, relationship: float, fatigue: float) -> float:
+    """
+    คำนวณ Emotional Score (1.0 - 10.0) จากปัจจัยของนักเรียน
+    (Kernel ตัวเลขล้วน ๆ ไม่แตะ KG ใช้ได้ทั้งการประเมินทีละคนและแบบ Batch)
+    """
+    # Formula: Base Confidence (7.0) - Stressors + Supports
+    stress_score = (load * W_LOAD) + (failures * W_FAIL) + (fatigue * W_FAT)
+    
+    support_score = relationship * W_REL
+    
+    final_score = 7.0 - (stress_score * 5.0) + (support_score * 3.0)
+    return max(1.0, min(10.0, final_score)) # จำกัดคะแนนระหว่าง 1 ถึง 10
+
+# เกณฑ์คะแนน -> สถานะ (STATES[i] ใช้กับคะแนนในช่วง [THRESHOLDS[i-1], THRESHOLDS[i]))
+THRESHOLDS = (2.0, 4.0, 6.5, 8.5)
+STATES = (EmotionalState.EXHAUSTED, EmotionalState.STRESSED, EmotionalState.ANXIOUS,
+          EmotionalState.CALM, EmotionalState.CONFIDENT)
+
+def score_to_emotional_state(final_score: float) -> "EmotionalState":
+    """แปลงคะแนนเป็นสถานะทางอารมณ์ (ค้นหาช่วงด้วย bisect แทน if/elif)"""
+    return STATES[bisect.bisect_right(THRESHOLDS, final_score)]
+
+# ตารางข้อความตอบสนองตามสถานะ (แทน if/elif: ดึงด้วย dict ครั้งเดียวแล้ว format ชื่อ)
+_RESPONSE_EXHAUSTED = "[{name}] ตรวจพบความเหนื่อยล้าสูง. ลดความถี่ในการใช้สกิลชั่วคราว. ท่านเซ็นเซย์กำลังดูอยู่, ทุกอย่างจะเรียบร้อยค่ะ." # คำแนะนำเชิงปลอบประโลมและลดภาระ
+_RESPONSE_CONFIDENT = "[{name}] สถานะยอดเยี่ยม. อนุญาตให้ใช้การตัดสินใจแบบ Real-Time ใน 10 วินาทีข้างหน้า. ลุยเลยค่ะ!" # คำสั่งที่ตรงไปตรงมาและมอบอำนาจ
+RESPONSE_TEMPLATES: Dict[EmotionalState, str] = {
+    EmotionalState.STRESSED: _RESPONSE_EXHAUSTED,
+    EmotionalState.EXHAUSTED: _RESPONSE_EXHAUSTED,
+    EmotionalState.ANXIOUS: "[{name}] อย่ากังวลไปเลยค่ะ! ข้อมูลยุทธวิธีของคุณแม่นยำเสมอ. พักหายใจ 3 วินาทีแล้วโจมตีเป้าหมาย A ตามแผน!", # ให้กำลังใจ
+    EmotionalState.CONFIDENT: _RESPONSE_CONFIDENT,
+    EmotionalState.DETERMINED: _RESPONSE_CONFIDENT,
+}
+DEFAULT_RESPONSE_TEMPLATE = "[{name}] สถานะปกติ. รอคำสั่งต่อไปค่ะ."
+
+# ตาราง Action Bias ตามสถานะ: (Accuracy_Modifier, Speed_Modifier, Risk_Tolerance)
+BIAS_KEYS = ("Accuracy_Modifier", "Speed_Modifier", "Risk_Tolerance")
+BIAS_TABLE: Dict[EmotionalState, Tuple[float, float, float]] = {
+    EmotionalState.STRESSED: (0.85, 1.0, 0.9),  # แม่นยำลดลง, ยอมรับความเสี่ยงสูงขึ้น (เพราะรีบร้อน)
+    EmotionalState.CONFIDENT: (1.05, 1.0, 0.2), # แม่นยำเพิ่มขึ้น, ยอมรับความเสี่ยงลดลง (เพราะเชื่อมั่นในแผน)
 }
+DEFAULT_BIAS = (1.0, 1.0, 0.5)
 
 # --- 2. THEORY OF MIND MANAGER (ToMM) ---
 
@@ -48,8 +102,8 @@ class TheoryOfMindManager:
     def __init__(self, kgm, rts):
         self.kgm = kgm # Knowledge Graph Manager instance
         self.rts = rts # Real-Time Scheduler instance
-        self.emotional_states: Dict[str, EmotionalState] = {} # Key: Student Name
-        print("[ToMM] Theory of Mind Manager initialized.")
+        self.emotional_states: Dict[int, EmotionalState] = {} # Key: Student Entity UID
+        logger.info("[ToMM] Theory of Mind Manager initialized.")
 
     def _get_student_entity(self, student_name: str) -> Optional[Any]:
         """ดึงข้อมูล Entity ของนักเรียนจาก KG"""
@@ -75,73 +129,66 @@ class TheoryOfMindManager:
         #    time.sleep(0.01)
 
         # 3. คำนวณ Emotional Score (0.0 - 10.0)
-        
-        # ดึงปัจจัยจาก KG (หรือใช้ค่าเริ่มต้นหากไม่พบ)
-        load = student.get_attribute("Combat_Load") or 0.0
-        failures = student.get_attribute("Recent_Failure_Count") or 0
-        relationship = student.get_attribute("Relationship_Strength") or 0.5
-        fatigue = student.get_attribute("Fatigue_Level") or 0.0
-
-        # Formula: Base Confidence (5.0) - Stressors + Supports
-        stress_score = (load * EMOTION_FACTOR_WEIGHTS["Combat_Load"]) + \
-                       (failures * EMOTION_FACTOR_WEIGHTS["Recent_Failure_Count"]) + \
-                       (fatigue * EMOTION_FACTOR_WEIGHTS["Fatigue_Level"])
-        
-        support_score = relationship * EMOTION_FACTOR_WEIGHTS["Relationship_Strength"]
-        
-        final_score = 7.0 - (stress_score * 5.0) + (support_score * 3.0)
-        final_score = max(1.0, min(10.0, final_score)) # จำกัดคะแนนระหว่าง 1 ถึง 10
+        final_score = compute_emotion_score(*self._get_emotion_factors(student))
 
         # 4. แปลงคะแนนเป็นสถานะทางอารมณ์
-        if final_score >= 8.5:
-            state = EmotionalState.CONFIDENT
-        elif final_score >= 6.5:
-            state = EmotionalState.CALM
-        elif final_score >= 4.0:
-            state = EmotionalState.ANXIOUS
-        elif final_score >= 2.0:
-            state = EmotionalState.STRESSED
-        else:
-            state = EmotionalState.EXHAUSTED
+        state = score_to_emotional_state(final_score)
             
-        self.emotional_states[student_name] = state
+        self.emotional_states[student.uid] = state
         student.set_attribute("Emotional_State", state.name) # อัปเดตกลับไปที่ KG
         
-        print(f"[ToMM RESULT] {student_name} Score: {final_score:.2f} -> State: {state.name}")
+        logger.debug("[ToMM RESULT] %s Score: %.2f -> State: %s", student_name, final_score, state.name)
         return state
 
+    def _get_emotion_factors(self, student) -> tuple:
+        """ดึงปัจจัยจาก KG (หรือใช้ค่าเริ่มต้นหากไม่พบ): (load, failures, relationship, fatigue)"""
+        return (student.get_attribute("Combat_Load") or 0.0,
+                student.get_attribute("Recent_Failure_Count") or 0,
+                student.get_attribute("Relationship_Strength") or 0.5,
+                student.get_attribute("Fatigue_Level") or 0.0)
+
+    def assess_emotional_state_batch(self, student_names: List[str]) -> Dict[str, EmotionalState]:
+        """
+        ประเมินสถานะทางอารมณ์ของนักเรียนหลายคนในครั้งเดียว
+        ส่ง Task เข้า RTS เพียงครั้งเดียวทั้ง Batch และคำนวณคะแนนด้วย Kernel เดียวกับการประเมินทีละคน
+        """
+        students = []
+        for name in student_names:
+            student = self.kgm.get_entity_by_name(name)
+            if student and student.entity_type == "Student":
+                students.append(student)
+
+        results: Dict[str, EmotionalState] = {name: EmotionalState.CALM for name in student_names} # ค่าเริ่มต้น
+        if not students:
+            return results
+
+        # 1. รัน Task เดียวสำหรับทั้ง Batch (ความซับซ้อนเพิ่มตามจำนวนนักเรียน แต่ไม่เกิน 1.0)
+        batch_task = AGI_Task(f"ToM_Assess_Batch_{len(students)}", TaskPriority.HIGH, min(1.0, 0.3 * len(students)))
+        self.rts.submit_task(batch_task)
+
+        # 2. คำนวณคะแนนและสถานะของทุกคน
+        scores = [compute_emotion_score(*self._get_emotion_factors(student)) for student in students]
+        for student, final_score in zip(students, scores):
+            state = score_to_emotional_state(final_score)
+            self.emotional_states[student.uid] = state
+            student.set_attribute("Emotional_State", state.name) # อัปเดตกลับไปที่ KG
+            results[student.name] = state
+            logger.debug("[ToMM RESULT] %s Score: %.2f -> State: %s", student.name, final_score, state.name)
+        return results
+
     def generate_human_response(self, student_name: str, current_state: EmotionalState) -> str:
         """
         สร้างการตอบสนองของ A.R.O.N.A. ที่เหมาะสมกับสถานะทางอารมณ์
         (นี่คือส่วนที่ LLM Persona จะใช้เป็น Input)
         """
-        if current_state == EmotionalState.STRESSED or current_state == EmotionalState.EXHAUSTED:
-            # คำแนะนำเชิงปลอบประโลมและลดภาระ
-            return f"[{student_name}] ตรวจพบความเหนื่อยล้าสูง. ลดความถี่ในการใช้สกิลชั่วคราว. ท่านเซ็นเซย์กำลังดูอยู่, ทุกอย่างจะเรียบร้อยค่ะ."
-        elif current_state == EmotionalState.ANXIOUS:
-            # คำแนะนำเชิงให้กำลังใจและเน้นย้ำความเชื่อมั่น
-            return f"[{student_name}] อย่ากังวลไปเลยค่ะ! ข้อมูลยุทธวิธีของคุณแม่นยำเสมอ. พักหายใจ 3 วินาทีแล้วโจมตีเป้าหมาย A ตามแผน!"
-        elif current_state == EmotionalState.CONFIDENT or current_state == EmotionalState.DETERMINED:
-            # คำสั่งที่ตรงไปตรงมาและมอบอำนาจ
-            return f"[{student_name}] สถานะยอดเยี่ยม. อนุญาตให้ใช้การตัดสินใจแบบ Real-Time ใน 10 วินาทีข้างหน้า. ลุยเลยค่ะ!"
-        else:
-            return f"[{student_name}] สถานะปกติ. รอคำสั่งต่อไปค่ะ."
+        return RESPONSE_TEMPLATES.get(current_state, DEFAULT_RESPONSE_TEMPLATE).format(name=student_name)
 
     def predict_action_bias(self, student_name: str, current_state: EmotionalState) -> Dict[str, float]:
         """
         คาดการณ์แนวโน้มการกระทำของนักเรียนตามสถานะทางอารมณ์
         (ใช้เป็น Input สำหรับ World Model ในการจำลองสถานการณ์)
         """
-        bias = {"Accuracy_Modifier": 1.0, "Speed_Modifier": 1.0, "Risk_Tolerance": 0.5}
-        
-        if current_state == EmotionalState.STRESSED:
-            bias["Accuracy_Modifier"] = 0.85 # แม่นยำลดลง
-            bias["Risk_Tolerance"] = 0.9    # ยอมรับความเสี่ยงสูงขึ้น (เพราะรีบร้อน)
-        elif current_state == EmotionalState.CONFIDENT:
-            bias["Accuracy_Modifier"] = 1.05 # แม่นยำเพิ่มขึ้น
-            bias["Risk_Tolerance"] = 0.2    # ยอมรับความเสี่ยงลดลง (เพราะเชื่อมั่นในแผน)
-        
-        return bias
+        return dict(zip(BIAS_KEYS, BIAS_TABLE.get(current_state, DEFAULT_BIAS)))
 
 # --- 3. EXECUTION EXAMPLE (Demonstration) ---
 
@@ -204,4 +251,5 @@ def run_arona_theory_of_mind():
     print("\n[ARONA] THEORY OF MIND MODULE INITIALIZATION COMPLETE.")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     run_arona_theory_of_mind()
@@ -9,12 +9,20 @@
 # Dependencies: Requires arona_symbolic_core.py (for KG data) and arona_resource_manager.py (for Task allocation)
 # =========================================================================
 
+import os
+import sys
 import time
-import random
 import numpy as np
-import uuid
-from typing import Dict, List, Any, Optional
+import itertools
+import warnings
+from types import SimpleNamespace
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
+try:
+    from numba import njit, prange, get_num_threads, set_num_threads # Optional JIT สำหรับ Kernel ของ Simulation; ใช้ NumPy แทนเมื่อไม่ได้ติดตั้ง
+except ImportError:
+    njit = prange = get_num_threads = set_num_threads = None
 
 # --- 1. SYSTEM DEFINITIONS AND CONFIGURATION ---
 
@@ -25,68 +33,367 @@ ARONA_CORE_ID = "0xA.R.O.N.A.::Kivotos_AGI_SRE"
 SIMULATION_RATE_PER_SECOND = 1000 # ความเร็วในการจำลอง: 1,000 การจำลองต่อวินาที
 MAX_SIMULATION_LENGTH_SECONDS = 60 # จำกัดความยาวการจำลองที่ 60 วินาที
 BATCH_SIZE_GPU = 32 # จำนวน Simulations ที่รันพร้อมกันบน GPU
+TERMINATION_CHECK_STRIDE = 16 # ตรวจเงื่อนไขสิ้นสุดทุก ๆ K เฟรม (เวลาจบคลาดเคลื่อนได้ไม่เกิน K เฟรม)
+TRAJECTORY_STRIDE = 10 # บันทึกตำแหน่งทุก ๆ K เฟรม (100 Hz เพียงพอสำหรับ Visualization)
+
+# Scoring Function: A.R.O.N.A. prioritize victory AND student health
+SCORE_HP_WEIGHT = 0.1
+SCORE_TIME_WEIGHT = 0.05
+SCORE_VICTORY_BONUS = 100.0 # Huge bonus for victory
 
 # World Model Dimensions (Simplified 2D Tactical View)
 WORLD_WIDTH = 1000
 WORLD_HEIGHT = 600
 
+# ตัวนับ Simulation ID ภายในโปรเซส (ไม่ต้องอ่าน /dev/urandom ทุกครั้งที่สร้าง World แบบ uuid4)
+_SIM_COUNTER = itertools.count()
+
 # --- 2. DATA STRUCTURES FOR SIMULATION ---
 
-class AgentState:
-    """สถานะของ Agent (นักเรียนหรือศัตรู) ใน World Model"""
-    def __init__(self, name: str, uid: str, role: str, position: np.ndarray, stats: Dict[str, Any]):
-        self.name = name
-        self.uid = uid
-        self.role = role
-        # ตำแหน่ง (x, y) ใน World Model
-        self.position = position 
-        self.stats = stats # HP, Attack, Defense, Skill Cooldown
-        self.is_alive = True
-        self.trajectory_history = [position.copy()]
-
-    def update_state(self, delta_time: float, environment: Dict):
-        """อัปเดตสถานะของ Agent ในหนึ่งเฟรมของ Simulation"""
-        if not self.is_alive:
-            return
-
-        # 1. Movement Logic (Simplified)
-        # ตัวอย่าง: Agent เคลื่อนที่ไปยังเป้าหมาย (หากมี)
-        speed = self.stats.get('Speed', 5.0)
-        
-        # 2. Combat Logic (Simplified)
-        if self.stats.get('Target_UID'):
-            # ตรวจสอบศัตรู
-            target = environment['agents'].get(self.stats['Target_UID'])
-            if target and target.is_alive:
-                # จำลองการโจมตี
-                if self.stats.get('Skill_Ready', True):
-                    damage = self.stats.get('Attack', 100) * random.uniform(0.9, 1.1)
-                    target.stats['HP'] = max(0, target.stats['HP'] - damage * delta_time)
-                    if target.stats['HP'] == 0:
-                        target.is_alive = False
-        
-        # 3. Apply Skill Cooldown
-        # (ตรรกะเพิ่มเติมสำหรับการจัดการ Cooldown, Heal, Buff/Debuff)
+# Signature ของ Kernel (คอมไพล์ทันทีตอน import แบบ Eager แทน Lazy JIT ตอนเรียกครั้งแรก)
+# pos, vel, hp, atk_dt, target, skill_ready, alive, active, rand, delta_time
+_STEP_KERNEL_SIGNATURE = "void(f4[:,:,:], f4[:,:,:], f4[:,:], f4[:], i4[:,:], b1[:,:], b1[:,:], b1[:], f4[:,:], f4)"
+
+_step_kernel = None
+if njit is not None:
+    try:
+        # cache=True: คอมไพล์ครั้งแรกแล้วเก็บไว้ใน __pycache__ โปรเซสถัดไปโหลดจาก Cache แทนการคอมไพล์ใหม่
+        @njit(_STEP_KERNEL_SIGNATURE, parallel=True, cache=True, fastmath=True, nogil=True)
+        def _step_kernel(pos, vel, hp, atk_dt, target, skill_ready, alive, active, rand, delta_time):
+            """
+            Kernel หนึ่งเฟรมสำหรับทุก Batch (ขนานตามมิติ Batch เพราะแต่ละ World ไม่ยุ่งกัน)
+            ภายใน World หนึ่งลูปเป็นลำดับ จึงไม่มี Race บน hp[t] แม้หลาย Agent โจมตีเป้าหมายเดียวกัน
+            ทุกคนโจมตีจากสถานะต้นเฟรมเหมือน NumPy path: ลูปแรกหักดาเมจโดยยังไม่แตะ alive
+            แล้วค่อย Clamp และอัปเดต alive ในลูปที่สอง (Agent ที่ถูกฆ่าในเฟรมนี้ยังโจมตีได้ในเฟรมนี้)
+            """
+            n_batch, n_agents = hp.shape
+            for b in prange(n_batch):
+                if not active[b]:
+                    continue
+                for i in range(n_agents):
+                    if not alive[b, i]:
+                        continue
+                    pos[b, 0, i] += vel[b, 0, i] * delta_time
+                    pos[b, 1, i] += vel[b, 1, i] * delta_time
+                    t = target[b, i]
+                    if skill_ready[b, i] and t >= 0 and alive[b, t]:
+                        hp[b, t] -= atk_dt[i] * rand[b, i]
+                for i in range(n_agents):
+                    # Clamp แบบไม่มี Branch (max -> maxss)
+                    h = max(hp[b, i], 0.0)
+                    hp[b, i] = h
+                    alive[b, i] = alive[b, i] and h > 0.0
+    except Exception as exc:
+        # คอมไพล์/Typing ล้มเหลว (เช่น numba ไม่เข้ากับ NumPy เวอร์ชันนี้): อย่าให้ import ล้ม ใช้ NumPy path แทน
+        _step_kernel = None
+        warnings.warn(f"[WM WARNING] Step kernel compilation failed ({exc!r}); falling back to the NumPy step.", RuntimeWarning)
+
+# รหัสบทบาทของ Agent ในอาร์เรย์ role (int8)
+ROLE_STUDENT = 0
+ROLE_ENEMY = 1
+ROLE_CODES = {"Student": ROLE_STUDENT, "Enemy": ROLE_ENEMY}
+ROLE_NAMES = ("Student", "Enemy")
+
+# เรคอร์ดค่าสถานะของ Agent หนึ่งตัว (ใช้ที่ขอบ API: โหลด/ส่งออก Roster; Hot Loop ใช้อาร์เรย์ SoA)
+AGENT_DTYPE = np.dtype([
+    ("hp", "f4"), ("attack", "f4"), ("defense", "f4"), ("speed", "f4"),
+    ("target", "i4"),       # แถวของเป้าหมาย (-1 = ไม่มี)
+    ("skill_ready", "?"),
+])
+
+class AgentView:
+    """
+    มุมมอง (View) ของ Agent หนึ่งตัวบนอาร์เรย์ SoA ของ WorldModel
+    มีไว้เพื่อความเข้ากันได้กับโค้ดภายนอกที่ยังใช้ API แบบออบเจ็กต์ (ไม่ใช้ใน Hot Loop)
+    batch คือดัชนีของ World ในมิติ Batch (ค่าเริ่มต้น 0 สำหรับ World เดี่ยว)
+    """
+    __slots__ = ("_world", "_row", "_batch")
+
+    def __init__(self, world: "WorldModel", row: int, batch: int = 0):
+        self._world = world
+        self._row = row
+        self._batch = batch
+
+    @property
+    def name(self) -> str:
+        return self._world.names[self._row]
+
+    @property
+    def uid(self) -> str:
+        return self._world.uids[self._row]
+
+    @property
+    def role(self) -> str:
+        return ROLE_NAMES[self._world.const.role[self._row]]
+
+    @property
+    def position(self) -> np.ndarray:
+        return self._world.mut.pos[self._batch, :, self._row]
+
+    @property
+    def is_alive(self) -> bool:
+        return bool(self._world.mut.alive[self._batch, self._row])
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """สำเนาค่าสถานะในรูปแบบ dict เดิม (HP, Attack, Defense, Speed, Target_UID, Skill_Ready)"""
+        world, row, b = self._world, self._row, self._batch
+        target = world.mut.target[b, row]
+        return {
+            "HP": float(world.mut.hp[b, row]),
+            "Attack": float(world.const.attack[row]),
+            "Defense": float(world.const.defense[row]),
+            "Speed": float(world.const.speed[row]),
+            "Target_UID": world.uids[target] if target >= 0 else None,
+            "Skill_Ready": bool(world.mut.skill_ready[b, row]),
+        }
 
-        # บันทึกประวัติการเคลื่อนที่
-        self.trajectory_history.append(self.position.copy())
+def _score_numpy(hp, role, alive, time_taken):
+    """
+    คะแนนของทุก Batch ด้วย Reduction ของ NumPy: คืน (score, HP นักเรียนที่เหลือ, ชนะหรือไม่)
+    งานมีขนาดแค่ B x N ต่อการเรียก จึงไม่ใช้ JIT (ไม่มีต้นทุนคอมไพล์ตอนเรียกครั้งแรก)
+    """
+    final_hp = hp.astype(np.float64) @ (role == ROLE_STUDENT)
+    enemy = role == ROLE_ENEMY
+    victory = ~alive[:, enemy].any(axis=1) if enemy.any() else np.zeros(hp.shape[0], bool)
+    scores = final_hp * SCORE_HP_WEIGHT - time_taken * SCORE_TIME_WEIGHT + np.where(victory, SCORE_VICTORY_BONUS, 0.0)
+    return scores, final_hp, victory
 
 # --- 3. WORLD MODEL (WM) ---
 
 class WorldModel:
     """
     แกนหลักของ World Model ที่ใช้สำหรับสร้างภาพจำลองของ Kivotos
+    สถานะของ Agent เก็บแบบ Structure-of-Arrays: หนึ่งแถว (row) ต่อ Agent ในทุกอาร์เรย์
+    self.mut: สถานะที่เปลี่ยนระหว่าง Simulation มีมิติ Batch นำหน้า (B, N) เพื่อรันหลาย Plan พร้อมกัน
+    self.const: ค่าคงที่ของ Agent (attack, defense, speed, role) อ่านอย่างเดียว ใช้ร่วมกันทุก Batch ในรูป (N,)
     """
-    def __init__(self, core_id: str, knowledge_graph_manager):
+    def __init__(self, core_id: str, knowledge_graph_manager, seed=None, verbose: bool = False):
         self.core_id = core_id
         self.kgm = knowledge_graph_manager
+        # seed: int / None / np.random.Generator (ส่ง Generator เพื่อใช้ลำดับสุ่มร่วมกับเจ้าของ เช่น PSE)
+        self._rng = np.random.default_rng(seed)
         self.environment: Dict[str, Any] = {
-            "agents": {},      # สถานะของนักเรียนและศัตรู (AgentState objects)
+            "agents": {},      # uid -> AgentView (มุมมองบนอาร์เรย์ SoA ด้านล่าง)
             "terrain": {},     # ข้อมูลภูมิประเทศ (Cover, Obstacles)
             "global_time": 0.0,
-            "simulation_id": str(uuid.uuid4())
+            "simulation_id": f"sim-{next(_SIM_COUNTER)}"
         }
-        print("[WM] World Model initialized.")
+        self._alloc_soa(0)
+        if verbose:
+            print("[WM] World Model initialized.")
+
+    def _alloc_soa(self, n: int, batch: int = 1):
+        """จองอาร์เรย์ SoA สำหรับ Agent n ตัว x World จำนวน batch ชุด"""
+        self.names: List[str] = [""] * n
+        self.uids: List[str] = [""] * n
+        self.uid_to_row: Dict[str, int] = {}
+        # ค่าคงที่เก็บเป็น float16 (ค่าสูงสุด ~3000 แม่นยำพอ); hp และ pos คงเป็น float32
+        # เพราะการลดต่อเฟรม (~0.15 HP, ~0.005 หน่วยระยะ) ต่ำกว่าความละเอียดของ float16 ที่ช่วงค่านั้น
+        self.const = SimpleNamespace(
+            attack=np.zeros(n, np.float16),
+            defense=np.zeros(n, np.float16),
+            speed=np.zeros(n, np.float16),
+            role=np.zeros(n, np.int8),                       # ROLE_STUDENT / ROLE_ENEMY
+        )
+        self._atk_dt: Optional[np.ndarray] = None             # attack * delta_time (คำนวณครั้งเดียวต่อค่า delta_time)
+        self._atk_dt_step: Optional[float] = None
+        # สถานะที่ Simulation แก้ไข: ขอบเขตของ snapshot()/restore()
+        self.mut = SimpleNamespace(
+            hp=np.zeros((batch, n), np.float32),
+            pos=np.zeros((batch, 2, n), np.float32),         # แถว x และแถว y แยกกัน (อ่านทีละพิกัดแบบ stride-1)
+            vel=np.zeros((batch, 2, n), np.float32),         # ความเร็ว (หน่วยระยะ/วินาที) รูปแบบเดียวกับ pos
+            target=np.full((batch, n), -1, np.int32),        # แถวของเป้าหมาย (-1 = ไม่มี)
+            skill_ready=np.ones((batch, n), bool),
+            alive=np.ones((batch, n), bool),
+        )
+        self._rand_buf = np.empty((batch, n), np.float32)     # บัฟเฟอร์ค่าสุ่มดาเมจ ใช้ซ้ำทุกเฟรม
+        self._hp_positive = np.empty((batch, n), bool)        # บัฟเฟอร์ hp > 0 สำหรับอัปเดต alive
+        self.start_trajectory(0, stride=0)
+
+    @property
+    def batch_size(self) -> int:
+        return self.mut.hp.shape[0]
+
+    def load_roster(self, names: List[str], uids: List[str], roles: List[str], positions, roster: np.ndarray):
+        """
+        โหลด Agent ทั้งหมดจาก Roster แบบ AGENT_DTYPE (หนึ่งเรคอร์ดต่อแถว) ลงอาร์เรย์ SoA
+        คัดลอกทีละ Field ทั้งคอลัมน์ ไม่ต้องอ่าน dict ทีละ Agent
+        """
+        self._alloc_soa(len(roster))
+        self.names = list(names)
+        self.uids = list(uids)
+        self.uid_to_row = {uid: row for row, uid in enumerate(self.uids)}
+        self.const.role[:] = [ROLE_CODES[role] for role in roles]
+        self.mut.pos[:] = np.asarray(positions, np.float32).T
+        self.mut.hp[:] = roster["hp"]
+        self.const.attack[:] = roster["attack"]
+        self.const.defense[:] = roster["defense"]
+        self.const.speed[:] = roster["speed"]
+        self.mut.target[:] = roster["target"]
+        self.mut.skill_ready[:] = roster["skill_ready"]
+
+    def set_target(self, agent_uid: str, target_uid: Optional[str], batch: Optional[int] = None):
+        """
+        เปลี่ยนเป้าหมายของ Agent (ทุก Batch หรือเฉพาะ Batch ที่ระบุ)
+        แปลง UID เป็นแถวครั้งเดียวที่นี่ Hot Loop อ่านเฉพาะอาร์เรย์ target (int32)
+        """
+        row = self.uid_to_row[agent_uid]
+        target_row = self.uid_to_row.get(target_uid, -1) if target_uid is not None else -1
+        if batch is None:
+            self.mut.target[:, row] = target_row
+        else:
+            self.mut.target[batch, row] = target_row
+
+    def set_velocity(self, agent_uid: str, velocity, batch: Optional[int] = None):
+        """กำหนดความเร็ว (vx, vy) ของ Agent ในทุก Batch หรือเฉพาะ Batch ที่ระบุ"""
+        row = self.uid_to_row[agent_uid]
+        if batch is None:
+            self.mut.vel[:, :, row] = velocity
+        else:
+            self.mut.vel[batch, :, row] = velocity
+
+    def to_roster(self, batch: int = 0) -> np.ndarray:
+        """ส่งออกสถานะของ World ที่ Batch ที่กำหนดเป็น Roster แบบ AGENT_DTYPE"""
+        roster = np.empty(len(self.uids), AGENT_DTYPE)
+        roster["hp"] = self.mut.hp[batch]
+        roster["attack"] = self.const.attack
+        roster["defense"] = self.const.defense
+        roster["speed"] = self.const.speed
+        roster["target"] = self.mut.target[batch]
+        roster["skill_ready"] = self.mut.skill_ready[batch]
+        return roster
+
+    def step(self, delta_time: float, active: Optional[np.ndarray] = None):
+        """
+        อัปเดตสถานะของ Agent ทุกตัวในทุก Batch สำหรับหนึ่งเฟรมของ Simulation ด้วย Whole-Array Ops
+        ทุก Agent โจมตีพร้อมกันจากสถานะต้นเฟรม (ไม่มีลูป Python ต่อ Agent หรือต่อ Batch)
+        active: mask (B,) ของ World ที่ยังต้องจำลองต่อ (None = ทุก World)
+        """
+        # 1. Movement Logic (Simplified): pos += vel * dt สำหรับ Agent ที่ยังมีชีวิต
+        # 2. Combat Logic (Simplified): ผู้โจมตี = ยังมีชีวิต, สกิลพร้อม, มีเป้าหมายที่ยังมีชีวิต
+        atk_dt = self._damage_per_tick(delta_time)
+        if _step_kernel is not None:
+            # Kernel เดียวรวมทั้ง Movement และ Combat
+            rand = self._draw_damage_rolls()
+            if active is None:
+                active = np.ones(self.batch_size, bool)
+            _step_kernel(self.mut.pos, self.mut.vel, self.mut.hp, atk_dt, self.mut.target, self.mut.skill_ready, self.mut.alive,
+                         active, rand, np.float32(delta_time))
+        else:
+            moving = self.mut.alive if active is None else self.mut.alive & active[:, None]
+            self.mut.pos += np.where(moving[:, None, :], self.mut.vel * np.float32(delta_time), np.float32(0.0))
+            self._step_numpy(atk_dt, active)
+
+        # 3. Apply Skill Cooldown
+        # (ตรรกะเพิ่มเติมสำหรับการจัดการ Cooldown, Heal, Buff/Debuff)
+
+        # บันทึกประวัติการเคลื่อนที่ (ตำแหน่งของทุก Agent ในเฟรมนี้)
+        self.tick += 1
+        if self.trajectory_stride and self.tick % self.trajectory_stride == 0:
+            self._record_frame()
+
+    def start_trajectory(self, n_steps: int, stride: int = TRAJECTORY_STRIDE):
+        """
+        จองบัฟเฟอร์ประวัติตำแหน่งล่วงหน้าสำหรับ Simulation ยาว n_steps เฟรม (ไม่ต้อง append ทีละเฟรม)
+        บันทึกเฟรมเริ่มต้นทันที และหลังจากนั้นทุก ๆ stride เฟรม (stride=0 = ไม่บันทึกประวัติเลย)
+        """
+        self.tick = 0
+        self.trajectory_stride = stride
+        n_frames = n_steps // stride + 1 if stride > 0 else 0
+        self.traj_xy = np.empty((n_frames,) + self.mut.pos.shape, np.float16) # (เฟรม, B, 2, n) ความละเอียดพอสำหรับ Visualization
+        self.traj_len = 0
+        self._record_frame()
+
+    def _record_frame(self):
+        if self.traj_len < self.traj_xy.shape[0]:
+            np.copyto(self.traj_xy[self.traj_len], self.mut.pos)
+            self.traj_len += 1
+
+    @property
+    def trajectory(self) -> np.ndarray:
+        """ประวัติตำแหน่งที่บันทึกแล้ว รูปแบบ (เฟรม, B, 2, n)"""
+        return self.traj_xy[:self.traj_len]
+
+    def _draw_damage_rolls(self) -> np.ndarray:
+        """สุ่มตัวคูณดาเมจ U(0.9, 1.1) ของทุก Agent ทุก Batch ลงบัฟเฟอร์เดิมด้วยการเรียก Generator ครั้งเดียว"""
+        buf = self._rand_buf
+        if buf.shape != self.mut.hp.shape:
+            buf = self._rand_buf = np.empty(self.mut.hp.shape, np.float32)
+        self._rng.random(dtype=np.float32, out=buf)
+        buf *= np.float32(0.2)
+        buf += np.float32(0.9)
+        return buf
+
+    def _damage_per_tick(self, delta_time: float) -> np.ndarray:
+        """attack * delta_time ของทุก Agent (Attack และ delta_time คงที่ตลอด Simulation จึงคำนวณครั้งเดียว)"""
+        if self._atk_dt_step != delta_time:
+            self._atk_dt = self.const.attack.astype(np.float32) * np.float32(delta_time) # คำนวณใน float32
+            self._atk_dt_step = delta_time
+        return self._atk_dt
+
+    def _step_numpy(self, atk_dt: np.ndarray, active: Optional[np.ndarray]):
+        """Combat Logic แบบ Whole-Array Ops (ใช้เมื่อไม่มี numba)"""
+        # สุ่มทุกเฟรมเหมือน Kernel (แม้ไม่มีการโจมตี) เพื่อให้ทั้งสอง Path ใช้ลำดับสุ่มเดียวกันจาก seed เดียวกัน
+        rolls = self._draw_damage_rolls()
+        attacking = self.mut.alive & self.mut.skill_ready & (self.mut.target >= 0)
+        if active is not None:
+            attacking &= active[:, None]
+        batch_idx, attacker = np.nonzero(attacking)
+        target = self.mut.target[batch_idx, attacker]
+        hits = self.mut.alive[batch_idx, target]
+        if hits.any():
+            batch_idx, attacker, target = batch_idx[hits], attacker[hits], target[hits]
+            damage = atk_dt[attacker] * rolls[batch_idx, attacker]
+            # subtract.at รองรับกรณีหลาย Agent โจมตีเป้าหมายเดียวกัน
+            np.subtract.at(self.mut.hp, (batch_idx, target), damage)
+            # Clamp และอัปเดต alive แบบไม่มี Branch ลงบัฟเฟอร์เดิม (ไม่จองอาร์เรย์ชั่วคราว)
+            if self._hp_positive.shape != self.mut.hp.shape:
+                self._hp_positive = np.empty(self.mut.hp.shape, bool)
+            np.maximum(self.mut.hp, 0.0, out=self.mut.hp)
+            np.greater(self.mut.hp, 0.0, out=self._hp_positive)
+            np.logical_and(self.mut.alive, self._hp_positive, out=self.mut.alive)
+
+    def state_key(self, batch: int = 0) -> Tuple[bytes, ...]:
+        """
+        ลายนิ้วมือ (Fingerprint) ของสถานะทั้งหมดของ World ที่ Batch ที่กำหนด
+        World สองชุดที่ได้ key เดียวกันจะให้ Simulation ที่มีการแจกแจงผลลัพธ์เหมือนกัน
+        """
+        return (
+            self.mut.hp[batch].tobytes(), self.mut.alive[batch].tobytes(), self.mut.target[batch].tobytes(),
+            self.mut.skill_ready[batch].tobytes(), self.mut.pos[batch].tobytes(), self.mut.vel[batch].tobytes(),
+            self.const.attack.tobytes(), self.const.defense.tobytes(), self.const.speed.tobytes(), self.const.role.tobytes(),
+        )
+
+    def copy_state_from(self, other: "WorldModel", batch_size: Optional[int] = None):
+        """
+        คัดลอกสถานะทั้งหมดจาก World อื่น (อาร์เรย์เป็นสำเนาของตัวเอง ไม่แชร์กับต้นฉบับ)
+        หากระบุ batch_size จะทำสำเนา World ที่ Batch 0 ของต้นฉบับซ้ำเป็น batch_size ชุด
+        """
+        self.environment = dict(other.environment)
+        self.names = list(other.names)
+        self.uids = list(other.uids)
+        self.uid_to_row = dict(other.uid_to_row)
+        self.const = SimpleNamespace(**{name: arr.copy() for name, arr in vars(other.const).items()})
+        self._atk_dt, self._atk_dt_step = other._atk_dt, other._atk_dt_step
+        self.mut = SimpleNamespace(**{
+            name: arr.copy() if batch_size is None else np.repeat(arr[:1], batch_size, axis=0)
+            for name, arr in vars(other.mut).items()
+        })
+        self.start_trajectory(0, stride=0)
+        self.environment["agents"] = {uid: AgentView(self, row) for uid, row in self.uid_to_row.items()}
+
+    def snapshot(self) -> Tuple[np.ndarray, ...]:
+        """สำเนาแบบอ่านอย่างเดียวของอาร์เรย์ใน self.mut (ค่าคงที่ใน self.const ไม่ต้องเก็บ)"""
+        snap = tuple(arr.copy() for arr in vars(self.mut).values())
+        for arr in snap:
+            arr.flags.writeable = False
+        return snap
+
+    def restore(self, snap: Tuple[np.ndarray, ...]):
+        """คืนสถานะจาก snapshot() ด้วย np.copyto ลงบัฟเฟอร์เดิม (memcpy ล้วน ไม่จองหน่วยความจำใหม่)"""
+        for dst, src in zip(vars(self.mut).values(), snap):
+            np.copyto(dst, src)
 
     def initialize_from_kg(self, tactical_event_name: str):
         """
@@ -104,44 +411,49 @@ class WorldModel:
         
         # ตัวอย่าง: โหลดนักเรียนที่ถูกกำหนดให้เข้าร่วมภารกิจ (สมมติว่ามีฟังก์ชัน get_deployed_students)
         
-        # Mock Students: (ต้องสร้าง AgentState จาก Entity Data)
-        yuuka_stats = {"HP": 1000, "Attack": 150, "Defense": 50, "Speed": 4.5, "Target_UID": None, "Skill_Ready": True}
-        yuuka_state = AgentState("Yuuka", "UID_Y001", "Student", np.array([100, 300]), yuuka_stats)
-        
-        arisu_stats = {"HP": 900, "Attack": 250, "Defense": 30, "Speed": 5.0, "Target_UID": "UID_E001", "Skill_Ready": True}
-        arisu_state = AgentState("Arisu", "UID_A001", "Student", np.array([150, 300]), arisu_stats)
-        
-        # Mock Enemy:
-        enemy_stats = {"HP": 3000, "Attack": 100, "Defense": 100, "Speed": 3.0}
-        enemy_state = AgentState("Goz", "UID_E001", "Enemy", np.array([800, 300]), enemy_stats)
-        
-        # กำหนดเป้าหมายเริ่มต้น
-        yuuka_state.stats['Target_UID'] = enemy_state.uid 
-        
-        self.environment["agents"] = {
-            yuuka_state.uid: yuuka_state,
-            arisu_state.uid: arisu_state,
-            enemy_state.uid: enemy_state
-        }
+        # Mock Students & Enemy: (ต้องสร้างเรคอร์ด AGENT_DTYPE จาก Entity Data)
+        names = ["Yuuka", "Arisu", "Goz"]
+        uids = ["UID_Y001", "UID_A001", "UID_E001"]
+        roles = ["Student", "Student", "Enemy"]
+        positions = [(100, 300), (150, 300), (800, 300)]
+        target_uids = ["UID_E001", "UID_E001", None] # กำหนดเป้าหมายเริ่มต้น
+        roster = np.array([
+            # hp,   attack, defense, speed, target, skill_ready
+            (1000.0, 150.0,  50.0,   4.5,   -1,     True),  # Yuuka
+            (900.0,  250.0,  30.0,   5.0,   -1,     True),  # Arisu
+            (3000.0, 100.0,  100.0,  3.0,   -1,     True),  # Goz
+        ], dtype=AGENT_DTYPE)
+        # แปลง Target_UID เป็นแถวของเป้าหมาย (ครั้งเดียว ไม่ต้องค้น dict ในทุกเฟรม)
+        roster["target"] = [uids.index(t) if t in uids else -1 for t in target_uids]
+
+        self.load_roster(names, uids, roles, positions, roster)
+        self.start_trajectory(0, stride=0)
+        self._damage_per_tick(1.0 / SIMULATION_RATE_PER_SECOND)
+
+        self.environment["agents"] = {uid: AgentView(self, row) for uid, row in self.uid_to_row.items()}
 
         print(f"[WM INFO] World Model initialized for event: {tactical_event_name}")
         return self
 
-    def apply_action(self, agent_uid: str, action: Dict):
+    def apply_action(self, agent_uid: str, action: Dict, batch: int = 0):
         """
-        ใช้ Action (คำสั่งของ Sensei/ARONA) เข้าสู่ World Model ก่อนรัน Simulation
+        ใช้ Action (คำสั่งของ Sensei/ARONA) เข้าสู่ World Model ที่ Batch ที่กำหนด ก่อนรัน Simulation
         Action เช่น {'type': 'EX_SKILL', 'target': 'UID_E001', 'skill_name': 'Yuuka_Calculation'}
+        หรือ {'type': 'RETARGET', 'target': 'UID_E001'} (target=None = เลิกโจมตี)
         """
-        agent = self.environment['agents'].get(agent_uid)
-        if agent and agent.is_alive and action['type'] == 'EX_SKILL':
-            print(f"[WM ACTION] Applying EX-Skill: {action['skill_name']} by {agent.name}")
+        row = self.uid_to_row.get(agent_uid)
+        hp = self.mut.hp[batch]
+        if row is not None and self.mut.alive[batch, row] and action['type'] == 'RETARGET':
+            self.set_target(agent_uid, action.get('target'), batch=batch)
+        elif row is not None and self.mut.alive[batch, row] and action['type'] == 'EX_SKILL':
+            print(f"[WM ACTION] Applying EX-Skill: {action['skill_name']} by {self.names[row]}")
             # Mock skill effect
             if 'Heal' in action['skill_name']:
-                agent.stats['HP'] += 500
+                hp[row] += 500
             elif 'Damage' in action['skill_name'] and action.get('target'):
-                target = self.environment['agents'].get(action['target'])
-                if target:
-                    target.stats['HP'] = max(0, target.stats['HP'] - 1000) # Big hit
+                target_row = self.uid_to_row.get(action['target'])
+                if target_row is not None:
+                    hp[target_row] = max(0.0, hp[target_row] - 1000) # Big hit
 
 # --- 4. PREDICTIVE SIMULATION ENGINE (PSE) ---
 
@@ -149,15 +461,64 @@ class PredictiveSimulationEngine:
     """
     รับผิดชอบในการรัน Simulation หลาย ๆ ครั้งเพื่อคาดการณ์ผลลัพธ์
     """
-    def __init__(self, rm, kgm):
+    def __init__(self, rm, kgm, seed=None, parallel_workers: int = 0):
         self.resource_manager = rm # เพื่อขอ GPU/eGPU power
         self.kgm = kgm
+        # parallel_workers > 0: รันกลุ่ม Plan (ขนาด BATCH_SIZE_GPU) พร้อมกันแบบ Monte-Carlo Parallel
+        # ใช้ Process เสมอ: Kernel แบบ parallel=True ห้ามถูกเรียกพร้อมกันจากหลาย Thread (workqueue layer จะ abort)
+        self.parallel_workers = parallel_workers
+        self._pool: Optional[Executor] = None
+        self._rng = np.random.default_rng(seed) # ทุก World ที่ PSE สร้างใช้ Generator ตัวนี้ร่วมกัน (ทำซ้ำได้ด้วย seed)
         self.simulations_run = 0
+        # Scratch World ที่ใช้ซ้ำข้าม run_batch: คืนสถานะด้วย restore() แทนการสร้าง WorldModel ใหม่ทุกครั้ง
+        self._scratch_world: Optional[WorldModel] = None
+        self._scratch_source: Optional[Tuple] = None   # (id ของ initial_world, state_key ของมัน)
+        self._initial_snapshot: Optional[Tuple[np.ndarray, ...]] = None
         print("[PSE] Predictive Simulation Engine initialized.")
 
-    def run_simulation(self, initial_world: WorldModel, actions_to_test: List[Dict], simulation_time: float) -> Dict[str, Any]:
+    def run_simulation(self, initial_world: WorldModel, actions_to_test: List[Dict], simulation_time: float,
+                       return_trajectory: bool = False) -> Dict[str, Any]:
         """
         รัน Simulation หนึ่งครั้งเพื่อคาดการณ์ผลลัพธ์ของ Action ที่กำหนด
+        Trajectory_Data จะเป็น {} เว้นแต่ระบุ return_trajectory=True (ดู simulate_with_trace)
+        """
+        return self.run_batch(initial_world, [actions_to_test], simulation_time, return_trajectory)[0]
+
+    def simulate_with_trace(self, initial_world: WorldModel, actions_to_test: List[Dict], simulation_time: float) -> Dict[str, Any]:
+        """รัน Simulation พร้อมบันทึกประวัติตำแหน่ง สำหรับ Replay/Visualization"""
+        return self.run_simulation(initial_world, actions_to_test, simulation_time, return_trajectory=True)
+
+    def run_batch(self, initial_world: WorldModel, action_plans: List[List[Dict]], simulation_time: float,
+                  return_trajectory: bool = False) -> List[Dict[str, Any]]:
+        """
+        รัน Simulation ของหลาย Action Plan พร้อมกัน (หนึ่ง Plan ต่อหนึ่ง Batch) แบบ GPU-style
+        ทุก World ถูก step ในการเรียก ufunc ชุดเดียวกัน และหยุดแยกกันเมื่อศัตรูใน World นั้นหมด
+        """
+        current_world = self._acquire_scratch_world(initial_world, len(action_plans))
+        return self.run_in_place(current_world, action_plans, simulation_time, return_trajectory)
+
+    def _acquire_scratch_world(self, initial_world: WorldModel, batch_size: int) -> WorldModel:
+        """
+        คืน Scratch World ขนาด batch_size ที่อยู่ในสถานะเริ่มต้นของ initial_world (ไม่แก้สถานะของ initial_world)
+        สร้างใหม่เฉพาะเมื่อ initial_world หรือขนาด Batch เปลี่ยน ไม่เช่นนั้นแค่ restore() จาก snapshot
+        """
+        source = (id(initial_world), initial_world.state_key(0))
+        scratch = self._scratch_world
+        if scratch is None or scratch.batch_size != batch_size or self._scratch_source != source:
+            scratch = WorldModel(initial_world.core_id, self.kgm, seed=self._rng)
+            scratch.copy_state_from(initial_world, batch_size=batch_size) # สำเนาอาร์เรย์ของตัวเอง
+            self._scratch_world = scratch
+            self._scratch_source = source
+            self._initial_snapshot = scratch.snapshot()
+        else:
+            scratch.restore(self._initial_snapshot)
+        return scratch
+
+    def run_in_place(self, current_world: WorldModel, action_plans: List[List[Dict]], simulation_time: float,
+                     return_trajectory: bool = False) -> List[Dict[str, Any]]:
+        """
+        รัน Simulation บน World ที่ให้มาโดยตรง (แก้ไขอาร์เรย์ของ current_world)
+        current_world ต้องมี batch_size เท่ากับจำนวน Action Plan; ใช้คู่กับ snapshot()/restore() เพื่อรันซ้ำ
         """
         
         # จำลองการขอทรัพยากร GPU (สำคัญมาก)
@@ -165,75 +526,144 @@ class PredictiveSimulationEngine:
         # ตรวจสอบว่า ResourceManager สามารถจัดสรรได้หรือไม่
         # (ในโลกจริง RTS จะต้องจัดลำดับงานนี้ก่อนรัน)
 
-        current_world = WorldModel(initial_world.core_id, self.kgm)
-        current_world.environment = initial_world.environment.copy() # Deep copy
+        batch_size = len(action_plans)
+        if current_world.batch_size != batch_size:
+            raise ValueError(f"World batch size {current_world.batch_size} does not match {batch_size} action plans.")
+        current_world.environment["simulation_id"] = f"sim-{next(_SIM_COUNTER)}"
+        delta_time = 1.0 / SIMULATION_RATE_PER_SECOND
+        n_steps = int(round(simulation_time * SIMULATION_RATE_PER_SECOND))
 
-        # Apply Actions ก่อนเริ่ม Simulation (Sensei/ARONA's command)
-        for action in actions_to_test:
-            current_world.apply_action(action['agent_uid'], action['action'])
+        # Apply Actions ก่อนเริ่ม Simulation (Sensei/ARONA's command) แยกตาม Batch
+        for b, actions_to_test in enumerate(action_plans):
+            for action in actions_to_test:
+                current_world.apply_action(action['agent_uid'], action['action'], batch=b)
+        current_world.start_trajectory(n_steps, stride=TRAJECTORY_STRIDE if return_trajectory else 0)
 
         # Simulation Loop
-        delta_time = 1.0 / SIMULATION_RATE_PER_SECOND
-        current_time = 0.0
+        enemy_rows = np.flatnonzero(current_world.const.role == ROLE_ENEMY)
+        has_enemy = enemy_rows.size > 0
+
+        # World ที่ยังมีศัตรูเหลืออยู่ (ไม่มีศัตรูเลย = จำลองจนหมดเวลา)
+        active = current_world.mut.alive[:, enemy_rows].any(axis=1) if has_enemy else np.ones(batch_size, bool)
+        finish_tick = np.where(active, n_steps, 0)
         
-        while current_time < simulation_time:
-            # อัปเดต Agent ทุกตัว
-            for agent in current_world.environment['agents'].values():
-                agent.update_state(delta_time, current_world.environment)
-
-            # ตรวจสอบเงื่อนไขสิ้นสุด (เช่น ศัตรูหลักตาย)
-            enemy = current_world.environment['agents'].get("UID_E001")
-            if enemy and not enemy.is_alive:
-                break
-            
-            current_time += delta_time
-
-        self.simulations_run += 1
+        chunk_start = 0
+        while chunk_start < n_steps and active.any():
+            # อัปเดต Agent ทุกตัวในทุก World ที่ยัง active ทีละ K เฟรม
+            chunk_end = min(chunk_start + TERMINATION_CHECK_STRIDE, n_steps)
+            for _ in range(chunk_start, chunk_end):
+                current_world.step(delta_time, active)
+
+            # ตรวจสอบเงื่อนไขสิ้นสุดแยกตาม Batch (เช่น ศัตรูหลักตาย) เฉพาะแถวของศัตรู
+            if has_enemy:
+                still_active = current_world.mut.alive[:, enemy_rows].any(axis=1)
+                finish_tick[active & ~still_active] = chunk_end - 1
+                active &= still_active
+            chunk_start = chunk_end
+
+        self.simulations_run += batch_size
         
-        # 1. ประเมินผลลัพธ์ (Evaluation Metrics)
-        final_hp = sum(a.stats['HP'] for a in current_world.environment['agents'].values() if a.role == "Student")
-        is_victory = not enemy.is_alive if enemy else False
+        # 1. ประเมินผลลัพธ์ (Evaluation Metrics) และคะแนนของทุก Batch ในการ Reduce ครั้งเดียว
+        time_taken = finish_tick * delta_time
+        scores, final_hp, is_victory = _score_numpy(current_world.mut.hp, current_world.const.role, current_world.mut.alive, time_taken)
+        trajectory = current_world.trajectory # (เฟรม, B, 2, n)
+        stride = current_world.trajectory_stride
         
-        return {
-            "Simulation_ID": current_world.environment["simulation_id"],
-            "Is_Victory": is_victory,
-            "Time_Taken": current_time,
-            "Remaining_Student_HP": final_hp,
-            "Trajectory_Data": {name: agent.trajectory_history for name, agent in current_world.environment['agents'].items()}
-        }
+        results = []
+        for b in range(batch_size):
+            trajectory_data = {}
+            if return_trajectory:
+                # ตัดเฟรมหลังจาก World นั้นจบแล้ว (ตำแหน่งถูกแช่แข็งระหว่างรอ Batch อื่น)
+                frames = trajectory[:min(1 + (finish_tick[b] + 1) // stride, len(trajectory)), b].copy()
+                trajectory_data = {uid: frames[:, :, row] for uid, row in current_world.uid_to_row.items()}
+            results.append({
+                "Simulation_ID": f"{current_world.environment['simulation_id']}#{b}",
+                "Is_Victory": bool(is_victory[b]),
+                "Time_Taken": float(time_taken[b]),
+                "Remaining_Student_HP": float(final_hp[b]),
+                "Score": float(scores[b]),
+                "Trajectory_Data": trajectory_data
+            })
+        return results
 
     def evaluate_tactical_options(self, event_name: str, candidate_actions: List[List[Dict]], sim_duration: float = 30.0) -> Dict[str, Any]:
         """
         รัน Simulations หลายชุดสำหรับแต่ละชุด Action เพื่อหาทางเลือกที่ดีที่สุด
+        Action Plan ถูกจัดเป็นกลุ่มละ BATCH_SIZE_GPU และรันพร้อมกันในแต่ละกลุ่ม
         """
-        initial_world = WorldModel(ARONA_CORE_ID, self.kgm).initialize_from_kg(event_name)
+        initial_world = WorldModel(ARONA_CORE_ID, self.kgm, seed=self._rng).initialize_from_kg(event_name)
         best_outcome = {"Score": -float('inf'), "Action_Plan": None, "Result": None}
         
         print(f"[PSE INFO] Evaluating {len(candidate_actions)} candidate action plans...")
 
-        for i, action_plan in enumerate(candidate_actions):
-            # รัน Simulation สำหรับ Action Plan นี้
-            result = self.run_simulation(initial_world, action_plan, sim_duration)
-            
-            # ประเมินคะแนน (Scoring Function)
-            # A.R.O.N.A. prioritize victory AND student health
-            score = (result['Remaining_Student_HP'] * 0.1) - (result['Time_Taken'] * 0.05)
-            if result['Is_Victory']:
-                score += 100.0 # Huge bonus for victory
+        chunks = [candidate_actions[start:start + BATCH_SIZE_GPU] for start in range(0, len(candidate_actions), BATCH_SIZE_GPU)]
+        if self.parallel_workers > 0 and len(chunks) > 1:
+            chunk_results = self._run_chunks_parallel(initial_world, chunks, sim_duration)
+        else:
+            chunk_results = self._run_chunks_serial(initial_world, chunks, sim_duration)
+
+        for start, chunk, results in zip(range(0, len(candidate_actions), BATCH_SIZE_GPU), chunks, chunk_results):
+            for i, (action_plan, result) in enumerate(zip(chunk, results), start):
+                # ประเมินคะแนน (Scoring Function) คำนวณไว้แล้วใน run_in_place
+                score = result['Score']
 
-            print(f"  -> Plan {i}: Score={score:.2f}, Victory={result['Is_Victory']}")
+                print(f"  -> Plan {i}: Score={score:.2f}, Victory={result['Is_Victory']}")
 
-            if score > best_outcome["Score"]:
-                best_outcome["Score"] = score
-                best_outcome["Action_Plan"] = action_plan
-                best_outcome["Result"] = result
+                if score > best_outcome["Score"]:
+                    best_outcome["Score"] = score
+                    best_outcome["Action_Plan"] = action_plan
+                    best_outcome["Result"] = result
 
         return best_outcome
 
+    def _run_chunks_serial(self, initial_world: WorldModel, chunks: List[List[List[Dict]]], sim_duration: float):
+        """รันทีละกลุ่ม (run_batch ใช้ Scratch World ชุดเดียวซ้ำทุกกลุ่มที่ขนาดเท่ากัน)"""
+        for chunk in chunks:
+            # รัน Simulation สำหรับ Action Plan ทั้งกลุ่ม
+            yield self.run_batch(initial_world, chunk, sim_duration, return_trajectory=False)
+
+    def _run_chunks_parallel(self, initial_world: WorldModel, chunks: List[List[List[Dict]]], sim_duration: float):
+        """
+        กระจายกลุ่ม Plan ไปยัง Worker Pool (แต่ละกลุ่มเป็น Monte-Carlo Sweep อิสระ)
+        แต่ละกลุ่มได้ seed ของตัวเองจาก Generator ของ PSE จึงทำซ้ำได้ และไม่แชร์ Generator ข้าม Process
+        """
+        if self._pool is None:
+            # แบ่ง Thread ของ prange ให้แต่ละ Worker เพื่อไม่ให้ Worker x Thread เกินจำนวน Core
+            n_threads = max(1, (os.cpu_count() or 1) // self.parallel_workers)
+            self._pool = ProcessPoolExecutor(max_workers=self.parallel_workers,
+                                             initializer=_init_pse_worker, initargs=(n_threads,))
+        # สำเนาที่ไม่มี kgm (ส่งข้าม Process ได้ และ Worker อ่านอย่างเดียว)
+        shared_world = WorldModel(initial_world.core_id, None)
+        shared_world.copy_state_from(initial_world)
+        seeds = self._rng.integers(2**63, size=len(chunks))
+        futures = [self._pool.submit(_simulate_plan_chunk, shared_world, chunk, sim_duration, int(seed))
+                   for chunk, seed in zip(chunks, seeds)]
+        for future in futures:
+            results, simulations_run = future.result()
+            self.simulations_run += simulations_run
+            yield results
+
+    def shutdown(self):
+        """หยุด Worker Pool (หากเคยเริ่มไว้)"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+def _init_pse_worker(n_threads: int):
+    """Initializer ของ Worker Process: จำกัดจำนวน Thread ของ Kernel (prange) ใน Process นี้"""
+    if set_num_threads is not None and _step_kernel is not None:
+        set_num_threads(min(n_threads, get_num_threads())) # ไม่เกิน NUMBA_NUM_THREADS
+
+def _simulate_plan_chunk(initial_world: WorldModel, chunk: List[List[Dict]], sim_duration: float, seed: int):
+    """Worker ของ Pool: รัน Action Plan หนึ่งกลุ่มด้วย PSE ภายใน Worker และคืน (ผลลัพธ์, จำนวน Simulation ที่รันจริง)"""
+    pse = PredictiveSimulationEngine(None, None, seed=seed)
+    results = pse.run_batch(initial_world, chunk, sim_duration, return_trajectory=False)
+    return results, pse.simulations_run
+
 # --- 5. EXECUTION EXAMPLE (Demonstration) ---
 # NOTE: Need to initialize dependencies first (KGM, RM)
 
-def run_arona_world_model():
+def run_arona_world_model(parallel_workers: int = 0):
     """จำลองการทำงานของ World Model"""
     
     # 1. Dependency Mocks (แทนที่ด้วย Instances จริงจาก Part 1 & 2)
@@ -253,7 +683,7 @@ def run_arona_world_model():
     rm = MockRM()
     
     # 2. Initialize PSE
-    pse = PredictiveSimulationEngine(rm, kg_manager)
+    pse = PredictiveSimulationEngine(rm, kg_manager, parallel_workers=parallel_workers)
     
     # 3. Define Candidate Actions (Scenario: Who uses EX-Skill first?)
     
@@ -280,9 +710,17 @@ def run_arona_world_model():
     print(f"Best Score: {best_plan['Score']:.2f}")
     print(f"Recommended Plan (A.R.O.N.A.'s Decision): {best_plan['Action_Plan']}")
     print(f"Simulation Result: Victory={best_plan['Result']['Is_Victory']}, Remaining HP={best_plan['Result']['Remaining_Student_HP']:.2f}")
+    pse.shutdown()
     
     print("\n[ARONA] WORLD MODEL MODULE INITIALIZATION COMPLETE.")
 
 if __name__ == "__main__":
     # ต้องติดตั้ง Python Libraries: numpy (pip install numpy)
-    run_arona_world_model()
+    # --parallel-pse[=N]: รันกลุ่ม Action Plan บน Worker N ตัว (ค่าเริ่มต้น: จำนวน CPU)
+    parallel_workers = 0
+    for arg in sys.argv[1:]:
+        if arg == "--parallel-pse":
+            parallel_workers = os.cpu_count() or 1
+        elif arg.startswith("--parallel-pse="):
+            parallel_workers = int(arg.split("=", 1)[1])
+    run_arona_world_model(parallel_workers)
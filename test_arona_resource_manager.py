@@ -0,0 +1,50 @@
+import heapq
+
+import arona_resource_manager as rm
+
+
+def _drain(scheduler):
+    return [heapq.heappop(scheduler.task_queue)[2].name for _ in range(len(scheduler.task_queue))]
+
+
+def test_queue_orders_by_priority_then_fifo():
+    scheduler = rm.RealTimeScheduler(rm.ResourceManager())
+    for name, priority in [("log_a", rm.TaskPriority.LOW), ("kg_1", rm.TaskPriority.MEDIUM),
+                           ("kg_2", rm.TaskPriority.MEDIUM), ("ex_skill", rm.TaskPriority.CRITICAL),
+                           ("kg_3", rm.TaskPriority.MEDIUM), ("log_b", rm.TaskPriority.LOW)]:
+        scheduler.submit_task(rm.AGI_Task(name, priority, 0.1))
+    assert _drain(scheduler) == ["ex_skill", "kg_1", "kg_2", "kg_3", "log_a", "log_b"]
+
+
+def test_submit_tasks_keeps_fifo_after_single_submits():
+    scheduler = rm.RealTimeScheduler(rm.ResourceManager())
+    scheduler.submit_task(rm.AGI_Task("first", rm.TaskPriority.HIGH, 0.1))
+    scheduler.submit_tasks([rm.AGI_Task(f"batch_{i}", rm.TaskPriority.HIGH, 0.1) for i in range(3)])
+    assert _drain(scheduler) == ["first", "batch_0", "batch_1", "batch_2"]
+
+
+def test_blocked_task_keeps_its_place_in_line():
+    manager = rm.ResourceManager()
+    scheduler = rm.RealTimeScheduler(manager)
+    # งานใหญ่ใช้ CPU ครึ่งหนึ่ง: งานใหญ่ตัวที่สามถูกบล็อกจนกว่าจะมีการคืนทรัพยากร
+    big = [rm.AGI_Task(f"big_{i}", rm.TaskPriority.HIGH, 1.0) for i in range(3)]
+    scheduler.submit_tasks(big)
+    scheduler.dispatch_tasks()
+    assert sorted(t.name for t in scheduler.running_tasks.values()) == ["big_0", "big_1"]
+    scheduler.submit_task(rm.AGI_Task("late", rm.TaskPriority.HIGH, 0.1))
+    assert _drain(scheduler) == ["big_2", "late"]
+
+
+def test_allocate_resources_matches_batch_of_one():
+    manager = rm.ResourceManager()
+    lines = []
+    task = rm.AGI_Task("world_model", rm.TaskPriority.REAL_TIME, 1.0)
+    assert manager.allocate_resources(task, lines)
+    assert len(lines) == len(rm.RESOURCE_ORDER)
+    allocated = [hw["allocated"] for hw in manager.get_status_report()["Internal_Status"]]
+    assert allocated == [round(req, 2) for req in task.resource_request_vec]
+    # งานละ 8 GB (RAM_CAP_PER_TASK): RAM 16 GB รับได้สองงาน
+    assert manager.allocate_resources(rm.AGI_Task("second", rm.TaskPriority.HIGH, 1.0))
+    blocked = rm.AGI_Task("third", rm.TaskPriority.HIGH, 1.0)
+    assert not manager.allocate_resources(blocked)
+    assert blocked.status == "Queued_Blocked"
@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+
+import arona_symbolic_core as sc
+
+
+def _build_graph():
+    kgm = sc.KnowledgeGraphManager("test")
+    yuuka = sc.Entity("Yuuka", "Student")
+    yuuka.set_attribute("Stress_Level", 40)
+    yuuka.set_attribute("Status", "Ready")
+    school = sc.Entity("Millennium", "School")
+    kgm.add_entity(yuuka)
+    kgm.add_entity(school)
+    kgm.add_relationship(sc.Relationship(yuuka.uid, school.uid, "BELONGS_TO"))
+    return kgm, yuuka
+
+
+def test_save_mutate_save_load_round_trip(tmp_path):
+    path = str(tmp_path / "kg.json")
+    kgm, yuuka = _build_graph()
+    assert not kgm._wal  # Not bound to a snapshot yet: nothing is logged
+    kgm.save_to_disk(path)
+
+    # Second save within snapshot_interval only appends the deltas to the WAL
+    yuuka.set_attribute("Stress_Level", 85)
+    yuuka.set_attribute("Status", "Exhausted")
+    arisu = sc.Entity("Arisu", "Student")
+    arisu.set_attribute("Stress_Level", 10)
+    kgm.add_entity(arisu)
+    kgm.add_relationship(sc.Relationship(arisu.uid, yuuka.uid, "FRIEND_OF", strength=0.7))
+    kgm.save_to_disk(path)
+    with open(path + sc.KG_WAL_SUFFIX, "rb") as wal:
+        assert len(wal.read().splitlines()) == 4
+    assert not kgm._wal
+
+    loaded = sc.KnowledgeGraphManager("reloaded")
+    assert loaded.load_from_disk(path)
+    assert {e.name: e.attributes for e in loaded.entities.values()} == {e.name: e.attributes for e in kgm.entities.values()}
+    assert sorted(r.to_dict()["type"] for r in loaded.relationships.values()) == ["BELONGS_TO", "FRIEND_OF"]
+    assert [e.name for e in loaded.get_entities_with_attribute("Status", "Exhausted")] == ["Yuuka"]
+    np.testing.assert_array_equal(loaded.column("Stress_Level"), [85.0, np.nan, 10.0])
+    friend = loaded.get_relationships_for_entity(loaded.get_entity_by_name("Arisu").uid, "FRIEND_OF")
+    assert [r.strength for r in friend] == [0.7]
+
+
+def test_compaction_folds_wal_into_snapshot(tmp_path):
+    path = str(tmp_path / "kg.json")
+    kgm, yuuka = _build_graph()
+    kgm.save_to_disk(path)
+    yuuka.set_attribute("Stress_Level", 70)
+    kgm.save_to_disk(path, force=True)
+    assert os.path.getsize(path + sc.KG_WAL_SUFFIX) == 0
+
+    loaded = sc.KnowledgeGraphManager("reloaded")
+    assert loaded.load_from_disk(path)
+    assert loaded.get_entity_by_name("Yuuka").get_attribute("Stress_Level") == 70
+
+
+def test_unsaved_graph_does_not_log():
+    kgm, yuuka = _build_graph()
+    for level in range(100):
+        yuuka.set_attribute("Stress_Level", level)
+    assert kgm._wal == []
+
+
+def test_hand_written_condition_sees_new_relationships():
+    kgm, yuuka = _build_graph()
+    sre = sc.SymbolicReasoningEngine(kgm)
+    sre.axioms, sre.critical_axioms, sre.normal_axioms = [], [], []
+
+    def has_friend(student):
+        return bool(kgm.get_relationships_for_entity(student.uid, "FRIEND_OF"))
+
+    sre.add_axiom(("RULE_Friend", "Student", has_friend, lambda e: {"Friend": e.name}, 10, None))
+    assert sre.run_inference_cycle() == []
+    # Yuuka's own attributes do not change: a memoized result would stay stale
+    kgm.add_relationship(sc.Relationship(yuuka.uid, kgm.get_entity_by_name("Millennium").uid, "FRIEND_OF"))
+    assert [r["entity"] for r in sre.run_inference_cycle()] == ["Yuuka"]
+
+
+def test_compiled_condition_memo_does_not_grow_attr_versions():
+    kgm = sc.KnowledgeGraphManager("test")
+    for i in range(5):
+        event = sc.Entity(f"Event_{i}", "Combat_Event")
+        event.set_attribute("Threat_Type", "Heavy_Armor" if i % 2 else "Unidentified")
+        kgm.add_entity(event)
+    sre = sc.SymbolicReasoningEngine(kgm)
+    sre.axioms, sre.critical_axioms, sre.normal_axioms = [], [], []
+    sre.add_axiom(sre.compile_axiom({
+        "rule_id": "RULE_Armor", "target_type": "Combat_Event",
+        "predicates": [("Threat_Type", "==", "Heavy_Armor")],
+        "action": lambda e: {"Armor": e.name}, "priority": 10,
+    }))
+    assert sorted(r["entity"] for r in sre.run_inference_cycle()) == ["Event_1", "Event_3"]
+    assert len(kgm.attr_version) == 0
+    kgm.get_entity_by_name("Event_0").set_attribute("Threat_Type", "Heavy_Armor")
+    assert sorted(r["entity"] for r in sre.run_inference_cycle()) == ["Event_0", "Event_1", "Event_3"]
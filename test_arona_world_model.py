@@ -0,0 +1,168 @@
+import numpy as np
+import pytest
+
+import arona_resource_manager as rm
+import arona_world_model as wm
+
+
+@pytest.fixture(autouse=True)
+def _core_definitions(monkeypatch):
+    # arona_world_model ใช้ AGI_Task/TaskPriority จาก Part 2 (ผู้ใช้โมดูลเป็นผู้เชื่อมให้)
+    monkeypatch.setattr(wm, "AGI_Task", rm.AGI_Task, raising=False)
+    monkeypatch.setattr(wm, "TaskPriority", rm.TaskPriority, raising=False)
+
+
+def _make_world(seed, hp, attack, target, roles, batch_size=1):
+    n = len(hp)
+    roster = np.zeros(n, wm.AGENT_DTYPE)
+    roster["hp"] = hp
+    roster["attack"] = attack
+    roster["target"] = target
+    roster["skill_ready"] = True
+    world = wm.WorldModel(wm.ARONA_CORE_ID, None, seed=seed)
+    world.load_roster([f"A{i}" for i in range(n)], [f"U{i}" for i in range(n)], roles,
+                      [(10.0 * i, 0.0) for i in range(n)], roster)
+    if batch_size > 1:
+        world.copy_state_from(world, batch_size=batch_size)
+    return world
+
+
+def _duel_world(seed=None):
+    # นักเรียน 1 คนโจมตีศัตรู hp 1.0 ด้วยดาเมจ 0.1 x U(0.9, 1.1) ต่อเฟรม: ศัตรูตายในเฟรมที่ 10-12
+    return _make_world(seed, hp=[800.0, 1.0], attack=[100.0, 0.0], target=[1, -1], roles=["Student", "Enemy"])
+
+
+def _skirmish_world(seed=None, batch_size=1):
+    # ศัตรูโจมตีนักเรียนกลับ: HP ที่เหลือของนักเรียนขึ้นกับค่าสุ่มทุกเฟรม
+    return _make_world(seed, hp=[1000.0, 1200.0, 300.0, 450.0], attack=[150.0, 120.0, 60.0, 80.0],
+                       target=[2, 3, 0, 1], roles=["Student", "Student", "Enemy", "Enemy"], batch_size=batch_size)
+
+
+def _without_ids(results):
+    return [{k: v for k, v in result.items() if k != "Simulation_ID"} for result in results]
+
+
+def test_victory_time_and_score_are_hand_computable():
+    pse = wm.PredictiveSimulationEngine(None, None, seed=3)
+    result = pse.run_simulation(_duel_world(), [], 1.0)
+    # ตรวจเงื่อนไขสิ้นสุดทุก TERMINATION_CHECK_STRIDE (16) เฟรม: ศัตรูตายในก้อนแรก -> จบที่เฟรม 15
+    assert result["Is_Victory"] is True
+    assert result["Time_Taken"] == pytest.approx(15 / wm.SIMULATION_RATE_PER_SECOND)
+    assert result["Remaining_Student_HP"] == pytest.approx(800.0)
+    assert result["Score"] == pytest.approx(800.0 * wm.SCORE_HP_WEIGHT - 0.015 * wm.SCORE_TIME_WEIGHT + wm.SCORE_VICTORY_BONUS)
+
+
+def test_timeout_runs_full_duration_without_victory():
+    world = _make_world(None, hp=[800.0, 500.0], attack=[100.0, 0.0], target=[-1, -1], roles=["Student", "Enemy"])
+    pse = wm.PredictiveSimulationEngine(None, None, seed=3)
+    result = pse.run_simulation(world, [], 0.05)
+    assert result["Is_Victory"] is False
+    assert result["Time_Taken"] == pytest.approx(0.05)
+    assert result["Score"] == pytest.approx(800.0 * wm.SCORE_HP_WEIGHT - 0.05 * wm.SCORE_TIME_WEIGHT)
+
+
+def test_worlds_in_a_batch_terminate_independently():
+    # Plan ที่ 2 เลิกโจมตี ศัตรูใน World นั้นจึงไม่ตาย และ World แรกต้องไม่รอ World ที่สอง
+    plans = [[], [{"agent_uid": "U0", "action": {"type": "RETARGET", "target": None}}]]
+    pse = wm.PredictiveSimulationEngine(None, None, seed=3)
+    won, idle = pse.run_batch(_duel_world(), plans, 0.1)
+    assert won["Is_Victory"] and won["Time_Taken"] == pytest.approx(0.015)
+    assert not idle["Is_Victory"] and idle["Time_Taken"] == pytest.approx(0.1)
+
+
+def test_run_batch_is_deterministic_for_a_seed():
+    plans = [[], [{"agent_uid": "U1", "action": {"type": "RETARGET", "target": "U2"}}]]
+    first = wm.PredictiveSimulationEngine(None, None, seed=11).run_batch(_skirmish_world(), plans, 2.0)
+    second = wm.PredictiveSimulationEngine(None, None, seed=11).run_batch(_skirmish_world(), plans, 2.0)
+    other = wm.PredictiveSimulationEngine(None, None, seed=12).run_batch(_skirmish_world(), plans, 2.0)
+    assert _without_ids(first) == _without_ids(second)
+    assert _without_ids(first) != _without_ids(other)
+
+
+def test_run_batch_leaves_initial_world_untouched():
+    world = _skirmish_world()
+    before = world.snapshot()
+    wm.PredictiveSimulationEngine(None, None, seed=1).run_batch(world, [[], []], 1.0)
+    for arr, saved in zip(vars(world.mut).values(), before):
+        np.testing.assert_array_equal(arr, saved)
+
+
+def test_snapshot_restore_round_trip():
+    world = _skirmish_world(seed=5, batch_size=2)
+    world.set_velocity("U0", (5.0, -2.0))
+    snap = world.snapshot()
+    assert not snap[0].flags.writeable
+    for _ in range(200):
+        world.step(0.001)
+    assert not np.array_equal(world.mut.hp, snap[0])
+    world.restore(snap)
+    for arr, saved in zip(vars(world.mut).values(), snap):
+        np.testing.assert_array_equal(arr, saved)
+
+
+def test_numpy_step_moves_and_damages(monkeypatch):
+    monkeypatch.setattr(wm, "_step_kernel", None)
+    world = _duel_world(seed=2)
+    world.set_velocity("U0", (5.0, -2.0))
+    for _ in range(100):
+        world.step(0.001)
+    np.testing.assert_allclose(world.mut.pos[0, :, 0], [0.5, -0.2], atol=1e-4)
+    assert not world.mut.alive[0, 1] and world.mut.hp[0, 1] == 0.0
+    assert world.mut.hp[0, 0] == 800.0
+
+
+def test_mutual_kill_resolves_from_start_of_tick_state():
+    # ทั้งสองฝ่ายได้ดาเมจถึงตายในเฟรมแรก: ต้องตายพร้อมกันไม่ว่าใครอยู่แถวก่อน (ทั้ง Kernel และ NumPy path)
+    world = _make_world(1, hp=[0.05, 0.05], attack=[100.0, 100.0], target=[1, 0], roles=["Student", "Enemy"])
+    world.step(0.001)
+    np.testing.assert_array_equal(world.mut.alive, [[False, False]])
+    np.testing.assert_array_equal(world.mut.hp, [[0.0, 0.0]])
+
+
+def test_step_kernel_matches_numpy_step(monkeypatch):
+    pytest.importorskip("numba")
+    assert wm._step_kernel is not None
+    # นักเรียนแต่ละคนโจมตีศัตรูคนละตัว (หนึ่งผู้โจมตีต่อเป้าหมาย) ศัตรูไม่โจมตีกลับ
+    # ลำดับการโจมตีภายในเฟรมจึงไม่มีผล และ Kernel กับ NumPy path ต้องให้ผลเดียวกัน
+    def make_world():
+        world = _make_world(7, hp=[1000.0, 1200.0, 300.0, 450.0], attack=[150.0, 120.0, 10.0, 10.0],
+                            target=[2, 3, -1, -1], roles=["Student", "Student", "Enemy", "Enemy"], batch_size=3)
+        world.set_velocity("U0", (5.0, -2.0))
+        world.set_velocity("U3", (-1.0, 3.0))
+        return world
+
+    active = np.array([True, False, True])
+    kernel_world = make_world()
+    for _ in range(3000):
+        kernel_world.step(0.001, active)
+
+    monkeypatch.setattr(wm, "_step_kernel", None)
+    numpy_world = make_world()
+    for _ in range(3000):
+        numpy_world.step(0.001, active)
+
+    np.testing.assert_allclose(kernel_world.mut.hp, numpy_world.mut.hp, rtol=1e-5, atol=1e-3)
+    np.testing.assert_allclose(kernel_world.mut.pos, numpy_world.mut.pos, rtol=1e-5)
+    np.testing.assert_array_equal(kernel_world.mut.alive, numpy_world.mut.alive)
+
+
+def test_step_kernel_matches_numpy_step_with_mutual_attackers(monkeypatch):
+    pytest.importorskip("numba")
+    # ยิงโต้ตอบกันและรุมเป้าหมายเดียวกัน มีผู้ตายระหว่างทาง: ผลต้องไม่ขึ้นกับว่าติดตั้ง numba หรือไม่
+    def make_world():
+        return _make_world(9, hp=[30.0, 25.0, 20.0, 40.0, 18.0], attack=[200.0, 150.0, 120.0, 180.0, 220.0],
+                           target=[3, 3, 4, 0, 1], roles=["Student", "Student", "Student", "Enemy", "Enemy"],
+                           batch_size=4)
+
+    kernel_world = make_world()
+    for _ in range(1000):
+        kernel_world.step(0.001)
+
+    monkeypatch.setattr(wm, "_step_kernel", None)
+    numpy_world = make_world()
+    for _ in range(1000):
+        numpy_world.step(0.001)
+
+    assert not numpy_world.mut.alive.all(axis=1).any()
+    np.testing.assert_allclose(kernel_world.mut.hp, numpy_world.mut.hp, rtol=1e-5, atol=1e-3)
+    np.testing.assert_array_equal(kernel_world.mut.alive, numpy_world.mut.alive)